@@ -0,0 +1,66 @@
+"""
+Per-construction cost of a Table.
+
+"full" is the user constructor, which sniffs the columns for dates when the index is not a
+DatetimeIndex. It is what every pandas operation on a Table used to run. "fast" is Table.from_frame,
+which pandas operations now take through _constructor. The pandas DataFrame figures are the floor.
+
+    PYTHONPATH=. python benchmarks/bench_construction.py
+"""
+import logging
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from quantools import Table
+
+N = 2000
+
+
+def per_call(func):
+    return min(timeit.repeat(func, number=N, repeat=5)) / N * 1e6
+
+
+def main():
+    logging.disable(logging.INFO)  # the full constructor logs each failed sniff
+    frame = pd.DataFrame(np.random.default_rng(0).normal(size=(250, 20)))
+    dated = frame.set_index(pd.date_range("2020-01-01", periods=250, name="date"))
+    table, dated_table = Table.from_frame(frame), Table(dated)
+
+    rows = [
+        (
+            "construction, RangeIndex",
+            lambda: Table(frame),
+            lambda: Table.from_frame(frame),
+            lambda: pd.DataFrame(frame),
+        ),
+        (
+            "construction, DatetimeIndex",
+            lambda: Table(dated),
+            lambda: Table.from_frame(dated),
+            lambda: pd.DataFrame(dated),
+        ),
+        (
+            "slice .iloc[:5]",
+            lambda: Table(frame.iloc[:5]),
+            lambda: table.iloc[:5],
+            lambda: frame.iloc[:5],
+        ),
+        (
+            "shallow copy",
+            lambda: Table(dated.copy(deep=False)),
+            lambda: dated_table.copy(deep=False),
+            lambda: dated.copy(deep=False),
+        ),
+    ]
+
+    print(f"{'us per call':<30} {'full':>8} {'fast':>8} {'pandas':>8}")
+    for name, full, fast, pandas in rows:
+        print(
+            f"{name:<30} {per_call(full):>8.1f} {per_call(fast):>8.1f} {per_call(pandas):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Cost of "import quantools" in a fresh interpreter, against the numpy and pandas floor, and the heavy
+modules it pulls in. bokeh and scipy are only imported on the first use of plot, report, autoplot,
+stationnarize or acf: a process computing Table.sharpe or Table.indicators never loads them.
+
+    PYTHONPATH=. python benchmarks/bench_import.py [--max-seconds S]
+
+With --max-seconds, it exits with an error when the import takes longer, or when a heavy module is
+imported with quantools.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY = ["bokeh", "matplotlib", "seaborn", "scipy", "statsmodels"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "heavy": [m for m in {heavy} if m in sys.modules]}}))
+"""
+
+
+def import_time(module: str, repeat: int = 5) -> dict:
+    # the best of several fresh interpreters, the first ones warming the file cache
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    runs = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+                capture_output=True,
+                text=True,
+                check=True,
+                env=env,
+            ).stdout.splitlines()[-1]
+        )
+        for _ in range(repeat)
+    ]
+    return min(runs, key=lambda run: run["seconds"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-seconds", type=float, default=None)
+    args = parser.parse_args()
+
+    floor = import_time("numpy, pandas")
+    quantools = import_time("quantools")
+    print(f"{'import':<20} {'seconds':>8}")
+    print(f"{'numpy, pandas':<20} {floor['seconds']:>8.3f}")
+    print(f"{'quantools':<20} {quantools['seconds']:>8.3f}")
+    print(f"heavy modules imported: {quantools['heavy'] or 'none'}")
+
+    if args.max_seconds is not None and (
+        quantools["seconds"] > args.max_seconds or quantools["heavy"]
+    ):
+        sys.exit("import quantools got heavier")
+
+
+if __name__ == "__main__":
+    main()
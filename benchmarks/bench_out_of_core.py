@@ -0,0 +1,71 @@
+"""
+Peak memory of stationnarize + normalize on npy panels of growing size, in memory and out of core.
+
+The out-of-core plan reads the panel by blocks of columns from its memory map and writes the result
+to an npy sink, so its peak stays at the memory budget while the in-memory peak grows with the panel.
+
+    PYTHONPATH=. python benchmarks/bench_out_of_core.py
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from quantools import LazyTable, Table
+from quantools.table._storage import create_npy
+
+N_PERIODS = 2520
+SIZES = [100, 200, 400, 800, 1600]
+MEMORY_BUDGET = 16 * 2**20
+
+
+def write_panel(path, n_columns, block=100):
+    index = pd.date_range("2000-01-01", periods=N_PERIODS, name="date")
+    values = create_npy(path, index, [f"asset_{i}" for i in range(n_columns)])
+    rng = np.random.default_rng(0)
+    for first in range(0, n_columns, block):
+        width = min(block, n_columns - first)
+        values[:, first : first + width] = np.cumsum(
+            rng.normal(1e-4, 1e-2, (N_PERIODS, width)), axis=0
+        )
+    values.flush()
+
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    print(f"{'columns':>8} {'panel MB':>9} {'in memory MB':>13} {'out of core MB':>15} {'time s':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n_columns in SIZES:
+            path = os.path.join(directory, f"panel_{n_columns}.npy")
+            sink = os.path.join(directory, f"out_{n_columns}.npy")
+            write_panel(path, n_columns)
+
+            _, in_memory = measure(
+                lambda: Table(Table(path).stationnarize(order=0.4)).normalize()
+            )
+            elapsed, out_of_core = measure(
+                lambda: LazyTable(path)
+                .stationnarize(order=0.4)
+                .normalize()
+                .collect(memory_budget=MEMORY_BUDGET, sink=sink)
+            )
+            panel = N_PERIODS * n_columns * 8 / 2**20
+            print(
+                f"{n_columns:>8} {panel:>9.1f} {in_memory:>13.1f} {out_of_core:>15.1f} {elapsed:>7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Wall time and peak memory of the main operations of quantools, on seeded Brownian tables of growing
+size, written to a JSON file that can be compared with an earlier run.
+
+Every case runs on each (rows, columns) size of the grid within its cell budget: rows * columns is at
+most 1e7, 1e5 for the order search, and plot builds the html report of one column. The cases are the
+CSV loaders, indicators, drawdowns, normalize, stationnarize at a fixed and at the searched order, and
+plot. The time is the best of --repeat runs, the peak memory is the peak of the Python and numpy
+allocations (tracemalloc) in one more run. The caches of the tables and the memoized orders of
+FractionalDiff are cleared before each run. The default grid takes a while: narrow it with --cases,
+--rows, --columns and --max-cells.
+
+    PYTHONPATH=. python benchmarks/suite.py --output bench.json
+    PYTHONPATH=. python benchmarks/suite.py --cases indicators drawdowns --rows 1e3 1e5 --columns 1 100
+    PYTHONPATH=. python benchmarks/suite.py --output new.json --compare bench.json
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+import quantools as qt
+import quantools.processing.fractionaldiff as fractionaldiff
+
+ROWS = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+COLUMNS = [1, 10, 100, 1_000, 10_000]
+MAX_CELLS = 10_000_000
+
+
+@dataclass
+class Case:
+    # setup(table, directory) returns the argument of run, and is not measured
+    run: Callable
+    setup: Callable = lambda table, directory: table
+    prices: bool = False
+    max_cells: int = MAX_CELLS
+    max_columns: Optional[int] = None
+
+
+def _write_csv(table, directory):
+    path = os.path.join(directory, "table.csv")
+    table.to_csv(path, index_label="date")
+    return path
+
+
+def _report(table, directory):
+    qt.report(table, os.path.join(directory, "report"))
+
+
+CASES = {
+    "read_csv": Case(lambda path: qt.Table(path, header=0), setup=_write_csv),
+    "read_csv_chunked": Case(
+        lambda path: qt.Table(path, header=0, chunksize=100_000), setup=_write_csv
+    ),
+    "indicators": Case(lambda table: table.indicators()),
+    "drawdowns": Case(lambda table: table.drawdowns()),
+    "normalize": Case(lambda table: table.normalize()),
+    "stationnarize_fixed": Case(lambda table: table.stationnarize(order=0.4), prices=True),
+    "stationnarize_auto": Case(
+        lambda table: table.stationnarize(), prices=True, max_cells=100_000
+    ),
+    "plot": Case(
+        lambda args: _report(*args),
+        setup=lambda table, directory: (table, directory),
+        max_cells=10_000_000,
+        max_columns=1,
+    ),
+}
+
+
+def make_table(n_rows: int, n_columns: int, prices: bool):
+    # pandas timestamps end in 2262, about 88k days after 2020: long series are by minutes
+    freq = "1D" if n_rows < 80_000 else "1min"
+    if prices:
+        return qt.generate_brownian_prices(
+            n_columns, n_rows, drift=1e-4, vol=1e-2, seed=0, freq=freq
+        )
+    return qt.generate_brownian_returns(
+        n_columns, n_rows + 1, drift=1e-4, vol=1e-2, seed=0, freq=freq
+    )
+
+
+def _reset(argument):
+    for value in argument if isinstance(argument, tuple) else (argument,):
+        if isinstance(value, (qt.Table, qt.TableSeries)):
+            value.cache_clear()
+    fractionaldiff._pvalue_cache.clear()
+    fractionaldiff._order_cache.clear()
+    gc.collect()
+
+
+def measure(case: Case, argument, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        _reset(argument)
+        start = time.perf_counter()
+        case.run(argument)
+        times.append(time.perf_counter() - start)
+
+    _reset(argument)
+    tracemalloc.start()
+    case.run(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": min(times),
+        "mean_seconds": float(np.mean(times)),
+        "peak_mb": peak / 2**20,
+    }
+
+
+def sizes(case: Case, rows: list, columns: list):
+    for n_rows in rows:
+        for n_columns in columns:
+            if n_rows * n_columns > case.max_cells:
+                continue
+            if case.max_columns is not None and n_columns > case.max_columns:
+                continue
+            yield n_rows, n_columns
+
+
+def machine() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def compare(results: list, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {
+            (r["case"], r["rows"], r["columns"]): r for r in json.load(f)["results"]
+        }
+    print(f"\n{'compared to ' + baseline_path:<48} {'time':>8} {'peak':>8}")
+    for r in results:
+        old = baseline.get((r["case"], r["rows"], r["columns"]))
+        if old is None:
+            continue
+        name = f"{r['case']} {r['rows']}x{r['columns']}"
+        print(
+            f"{name:<48} {r['seconds'] / old['seconds']:>7.2f}x "
+            f"{r['peak_mb'] / max(old['peak_mb'], 1e-9):>7.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--rows", nargs="+", type=float, default=ROWS)
+    parser.add_argument("--columns", nargs="+", type=float, default=COLUMNS)
+    parser.add_argument(
+        "--max-cells", type=float, default=None, help="the cell budget of every case"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="the JSON file of the results")
+    parser.add_argument("--compare", default=None, help="the JSON file of an earlier run")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)  # stationnarize logs the order of each column
+    rows, columns = [int(n) for n in args.rows], [int(n) for n in args.columns]
+
+    results = []
+    print(f"{'case':<24} {'rows':>10} {'columns':>8} {'time s':>9} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.cases:
+            case = CASES[name]
+            if args.max_cells is not None:
+                case.max_cells = int(args.max_cells)
+            for n_rows, n_columns in sizes(case, rows, columns):
+                table = make_table(n_rows, n_columns, case.prices)
+                argument = case.setup(table, directory)
+                result = {
+                    "case": name,
+                    "rows": n_rows,
+                    "columns": n_columns,
+                    **measure(case, argument, args.repeat),
+                }
+                results.append(result)
+                print(
+                    f"{name:<24} {n_rows:>10} {n_columns:>8} "
+                    f"{result['seconds']:>9.4f} {result['peak_mb']:>9.1f}",
+                    flush=True,
+                )
+                del table, argument
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({"machine": machine(), "results": results}, f, indent=2)
+    if args.compare is not None:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
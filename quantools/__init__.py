@@ -1,13 +1,17 @@
-from .processing.fractionaldiff import FractionalDiff
-from .table import Table, TableSeries
-from .plotting import plot
-from .utils.sample_data import generate_brownian_prices, generate_brownian_returns
-
+from .processing import DiskCache, FractionalDiff, StreamingFractionalDiff
+from .table import LazyTable, Table, TableSeries
+from .utils.autocorrelation import acf, pacf
+from .utils.montecarlo import monte_carlo_indicators
+from .utils.profiling import profile
+from .utils.sample_data import (
+    generate_brownian_prices,
+    generate_brownian_returns,
+    iter_brownian_paths,
+    simulate_brownian_paths,
+)
 
+import importlib
 import logging
-import seaborn as sns
-
-sns.set()
 
 logger = logging.getLogger()  # Logger
 logger_handler = logging.StreamHandler()  # Handler for the logger
@@ -17,4 +21,17 @@ logger.addHandler(logger_handler)
 logger_handler.setFormatter(logging.Formatter('Quantools : %(message)s'))
 logging.basicConfig(level=logging.INFO)
 
-__all__ = ["Table", "TableSeries", "FractionalDiff", "plot", "generate_brownian_prices", "generate_brownian_returns"]
\ No newline at end of file
+__all__ = ["Table", "TableSeries", "LazyTable", "DiskCache", "FractionalDiff", "StreamingFractionalDiff", "plot", "report", "generate_brownian_prices", "generate_brownian_returns", "simulate_brownian_paths", "iter_brownian_paths", "monte_carlo_indicators", "acf", "pacf", "profile"]
+
+
+def __getattr__(name: str):
+    # the plotting stack (bokeh) is only imported on the first use of plot, report or autoplot
+    if name in ("plot", "report"):
+        return getattr(importlib.import_module(".plotting", __name__), name)
+    if name == "plotting":
+        return importlib.import_module(".plotting", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | {"plotting", *__all__})
@@ -1,3 +1,4 @@
 from ._plot import plot
+from ._report import report
 
-__all__ = ["plot"]
\ No newline at end of file
+__all__ = ["plot", "report"]
\ No newline at end of file
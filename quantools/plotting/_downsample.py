@@ -0,0 +1,101 @@
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    It keeps the minimum and the maximum of each of n_buckets consecutive buckets, so that every spike
+    survives the downsampling
+
+    :param y: the values
+    :type y: np.ndarray
+    :param n_buckets: the number of buckets, e.g. the width of the plot in pixels
+    :type n_buckets: int
+    :return: the sorted indices of the points kept, at most 2 * n_buckets
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(n_buckets, size)
+
+    offsets = np.arange(n_buckets) * size
+    highest = np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1) + offsets
+    lowest = np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1) + offsets
+    return np.unique(np.concatenate(([0, n - 1], highest, lowest)))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: in each bucket, it keeps the point making the largest triangle with
+    the point kept in the previous bucket and the average of the next bucket
+
+    :param x: the abscissas, increasing
+    :type x: np.ndarray
+    :param y: the values
+    :type y: np.ndarray
+    :param n_out: the number of points kept
+    :type n_out: int
+    :return: the sorted indices of the points kept
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # the first and last points are kept, the others are split in n_out - 2 buckets
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(int)
+    bounds = np.append(bounds, n)
+    kept = np.empty(n_out, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    for i in range(n_out - 2):
+        lo, hi, next_hi = bounds[i], bounds[i + 1], bounds[i + 2]
+        with np.errstate(invalid="ignore"):
+            next_x, next_y = x[hi:next_hi].mean(), np.nanmean(y[hi:next_hi])
+        prev_x, prev_y = x[kept[i]], y[kept[i]]
+        area = np.abs(
+            (prev_x - next_x) * (y[lo:hi] - prev_y) - (prev_x - x[lo:hi]) * (next_y - prev_y)
+        )
+        kept[i + 1] = lo + np.argmax(np.nan_to_num(area, nan=-1.0))
+    return kept
+
+
+def downsample(
+    index: pd.Index,
+    y: np.ndarray,
+    max_points: Optional[int],
+    method: str = "minmax",
+    keep: Sequence[int] = (),
+) -> np.ndarray:
+    """
+    It chooses the points of a series to plot within a point budget
+
+    :param index: the abscissas of the series, e.g. a DatetimeIndex
+    :type index: pd.Index
+    :param y: the values
+    :type y: np.ndarray
+    :param max_points: the point budget, None to keep every point
+    :type max_points: Optional[int]
+    :param method: "minmax" or "lttb", defaults to "minmax"
+    :type method: str
+    :param keep: indices always kept, e.g. the trough of the maximum drawdown
+    :type keep: Sequence[int]
+    :return: the sorted indices of the points kept
+    """
+    if max_points is None or len(y) <= max_points:
+        return np.arange(len(y))
+    if method == "minmax":
+        kept = minmax_indices(y, max(max_points // 2 - 1, 1))
+    elif method == "lttb":
+        x = index.asi8 if isinstance(index, pd.DatetimeIndex) else np.arange(len(y))
+        kept = lttb_indices(x, y, max_points)
+    else:
+        raise ValueError(f"The method must be in ['minmax', 'lttb'], not {method}")
+    return np.union1d(kept, np.asarray(keep, dtype=int))
@@ -1,3 +1,8 @@
+import base64
+import os
+from functools import lru_cache
+from typing import Optional
+
 import numpy as np
 
 from bokeh.layouts import column, layout, row
@@ -8,6 +13,49 @@ from bokeh.models.widgets import DataTable, TableColumn, Div
 
 import quantools as qt
 
+from ..utils.autocorrelation import acf
+from ._downsample import downsample
+
+
+@lru_cache(maxsize=None)
+def _logo_url() -> str:
+    # the logo shipped with the package, embedded in the document: no network access
+    with open(os.path.join(os.path.dirname(__file__), "logo_quantools.png"), "rb") as f:
+        return "data:image/png;base64," + base64.b64encode(f.read()).decode()
+
+
+def _max_drawdown_points(cumulative: np.ndarray) -> list:
+    # the trough of the maximum drawdown and the peak before it
+    price = cumulative + 1
+    drawdown = np.fmax.accumulate(price) - price
+    if np.isnan(drawdown).all():
+        return []
+    trough = int(np.nanargmax(drawdown))
+    return [int(np.nanargmax(price[: trough + 1])), trough]
+
+
+def _window_data(
+    index: pd.Index,
+    columns: dict,
+    y: str,
+    keep: list,
+    max_points: Optional[int],
+    method: str,
+    window: slice = slice(None),
+) -> dict:
+    # the downsampled columns of the rows of the window
+    window = slice(*window.indices(len(index))[:2])
+    keep = [k - window.start for k in keep if window.start <= k < window.stop]
+    rows = window.start + downsample(index[window], columns[y][window], max_points, method, keep)
+    return {"date": index[rows], **{name: values[rows] for name, values in columns.items()}}
+
+
+def _as_timestamp(value) -> pd.Timestamp:
+    # the ends of a datetime range are sent back by the browser as milliseconds since the epoch
+    if isinstance(value, (int, float)):
+        return pd.Timestamp(value, unit="ms")
+    return pd.Timestamp(value)
+
 
 def plot(
     self: qt.TableSeries,
@@ -19,19 +67,40 @@ def plot(
         "indicators",
     ],
     return_type: str = "percentage",
+    max_points: Optional[int] = 2000,
+    downsampling: str = "minmax",
+    server: bool = False,
+    stats: Optional[dict] = None,
 ):
     """
-    Plot the table with bokeh
+    Plot the table with bokeh. The lines are downsampled to at most about max_points points, so that the
+    size of the document does not grow with the length of the series. The peak and the trough of the
+    maximum drawdown are always kept
+
+    :param max_points: the point budget of each line, None to plot every point, defaults to 2000
+    :type max_points: Optional[int]
+    :param downsampling: "minmax" (the extremes of each bucket) or "lttb", defaults to "minmax"
+    :type downsampling: str
+    :param server: when the layout is served by a bokeh server, downsample again the selected range
+    when it changes, so that zooming in shows the detail, defaults to False
+    :type server: bool
+    :param stats: precomputed "indicators", "drawdowns" and "autocorrelation" of the series, as given
+    by report, defaults to None (computed here)
+    :type stats: Optional[dict]
     """
+    stats = stats or {}
 
     self_df = self.as_df()
+    base = {
+        "value": self_df.to_numpy(dtype=float),
+        "cumulative": ((self_df + 1).cumprod() - 1).to_numpy(dtype=float),
+    }
+    base_keep = _max_drawdown_points(base["cumulative"])
     source_base = ColumnDataSource(
-        data={
-            "date": self_df.index,
-            "value": self_df,
-            "cumulative": (self_df + 1).cumprod() - 1,
-        }
+        data=_window_data(self_df.index, base, "cumulative", base_keep, max_points, downsampling)
     )
+    # the overview under the range tool always shows the whole series
+    source_overview = ColumnDataSource(data=dict(source_base.data)) if server else source_base
 
     col1, col2 = [], []
 
@@ -39,9 +108,7 @@ def plot(
 
     logo = figure(width=col2_width, height=80)
     logo.image_url(
-        url=[
-            "https://raw.githubusercontent.com/g0bel1n/quantools/ffab9076176d58466ef82771fb9f11b14346246a/images/logo_quantools.png"
-        ],
+        url=[_logo_url()],
         anchor="center",
         x=0,
         y=0,
@@ -100,7 +167,7 @@ def plot(
         background_fill_color="#efefef",
     )
 
-    select.line(x="date", y="cumulative", source=source_base, color="red")
+    select.line(x="date", y="cumulative", source=source_overview, color="red")
     select.ygrid.grid_line_color = None
     select.add_tools(range_tool)
     select.toolbar.active_multi = range_tool # type: ignore
@@ -123,7 +190,9 @@ def plot(
 
     if "indicators" in to_plot:
 
-        indicators_df = self.indicators()
+        indicators_df = stats.get("indicators")
+        if indicators_df is None:
+            indicators_df = self.indicators()
 
         if not indicators_df.empty:
             indicators_df = indicators_df.rename(
@@ -153,7 +222,7 @@ def plot(
 
         hist, edges = np.histogram(increment, bins=50, density=True)
         mean, var = increment.mean(), increment.std() ** 2
-        x = np.linspace(increment.min(), increment.max(), len(increment))
+        x = np.linspace(increment.min(), increment.max(), 200)
         pdf = 1 / np.sqrt(2 * np.pi * var) * np.exp(-((x - mean) ** 2) / (2 * var))
 
         p_n.quad(
@@ -170,11 +239,26 @@ def plot(
         x_range=p.x_range,
         title="Drawdown",
     )
+    refreshed = [(source_base, self_df.index, base, "cumulative", base_keep)]
     if "drawdown" in to_plot:
-        drawdowns = self.drawdowns()
-
+        drawdowns = stats.get("drawdowns")
+        if drawdowns is None:
+            drawdowns = self.drawdowns()
+
+        # drawdowns are computed on daily data
+        drawdown = {"drawdowns": -drawdowns.to_numpy(dtype=float)}
+        drawdown_keep = (
+            [int(np.nanargmin(drawdown["drawdowns"]))]
+            if drawdowns.notna().any()
+            else []
+        )
         source_drawdowns = ColumnDataSource(
-            data=dict(date=self_df.index, drawdowns=-drawdowns.values)
+            data=_window_data(
+                drawdowns.index, drawdown, "drawdowns", drawdown_keep, max_points, downsampling
+            )
+        )
+        refreshed.append(
+            (source_drawdowns, drawdowns.index, drawdown, "drawdowns", drawdown_keep)
         )
 
         p_d.line(x="date", y="drawdowns", source=source_drawdowns, color="red")
@@ -194,7 +278,10 @@ def plot(
             x_range=p.x_range,
             title="Returns",
         )
-        p_r.line(x=self_df.index, y=self_df, color="red")
+        returns = _window_data(
+            self_df.index, {"value": base["value"]}, "value", [], max_points, downsampling
+        )
+        p_r.line(x=returns["date"], y=returns["value"], color="red")
         p_r.xaxis.visible = False
         p_r.toolbar_location = None # type: ignore
 
@@ -206,9 +293,11 @@ def plot(
             height=200,
             title=f"Autocorrelation, unit: {self_df.index.freqstr}", # type: ignore
         )
-        df_with_lags = pd.concat([self_df.shift(i) for i in range(100)], axis=1)
-        autocorr = df_with_lags.corr().iloc[0, 1:]
-        lag = np.arange(1, 100)
+        autocorr = stats.get("autocorrelation")
+        if autocorr is None:
+            autocorr = acf(self_df, nlags=99)
+        autocorr = autocorr.iloc[1:]
+        lag = autocorr.index
 
         source_autocorr = ColumnDataSource(data={"lag": lag, "autocorr": autocorr})
 
@@ -222,4 +311,17 @@ def plot(
 
         col2.append(p_a)
 
+    if server and max_points is not None:
+
+        def refresh(attr, old, new):
+            start, end = _as_timestamp(p.x_range.start), _as_timestamp(p.x_range.end)
+            for source, index, columns, y, keep in refreshed:
+                window = index.slice_indexer(start, end)
+                source.data = _window_data(
+                    index, columns, y, keep, max_points, downsampling, window
+                )
+
+        p.x_range.on_change("start", refresh)
+        p.x_range.on_change("end", refresh)
+
     return layout(row(column(col1), column(col2)))
@@ -0,0 +1,141 @@
+import logging
+import os
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from bokeh.embed import file_html
+from bokeh.resources import CDN, INLINE
+
+from ..utils.autocorrelation import acf
+from ._plot import plot
+
+logger = logging.getLogger(__name__)
+
+
+def report_statistics(table) -> Dict[str, pd.DataFrame]:
+    """
+    It computes the statistics plotted for every numeric column of a table, each in one vectorized pass
+
+    :param table: the table
+    :type table: Table
+    :return: the "indicators", "drawdowns" and "autocorrelation" DataFrames, one column per column
+    """
+    num = table.select_dtypes(include="number")
+    return {
+        "indicators": num.indicators(),
+        "drawdowns": num.drawdowns(),
+        "autocorrelation": acf(num, nlags=99),
+    }
+
+
+def column_stats(stats: Dict[str, pd.DataFrame], col) -> dict:
+    # the statistics of one column, in the shapes plot expects
+    return {
+        "indicators": stats["indicators"][[col]],
+        "drawdowns": stats["drawdowns"][col],
+        "autocorrelation": stats["autocorrelation"][col],
+    }
+
+
+def _filename(col) -> str:
+    return re.sub(r"[^\w.-]", "_", str(col)) + ".html"
+
+
+def _render(
+    series: list, stats: list, directory: str, inline: bool, kwargs: dict
+) -> Tuple[List[str], float, float]:
+    # runs in a worker process: builds the layouts of a chunk of columns and writes their html
+    paths, layout_time, html_time = [], 0.0, 0.0
+    for serie, serie_stats in zip(series, stats):
+        start = time.perf_counter()
+        layout = plot(serie, stats=serie_stats, **kwargs)
+        layout_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        path = os.path.join(directory, _filename(serie.name))
+        html = file_html(layout, INLINE if inline else CDN, title=str(serie.name))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        html_time += time.perf_counter() - start
+        paths.append(path)
+    return paths, layout_time, html_time
+
+
+def _run(tasks, executor: Executor):
+    futures = [executor.submit(_render, *task) for task in tasks]
+    return [future.result() for future in futures]
+
+
+def report(
+    self,
+    directory: str,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    inline: bool = False,
+    return_timings: bool = False,
+    **kwargs,
+) -> Union[List[str], Tuple[List[str], Dict[str, float]]]:
+    """
+    It writes a standalone html tear sheet (see plot) per numeric column of the table. The statistics
+    of all the columns are computed once, in vectorized passes, then the layouts are built and written
+    by chunks of columns, optionally on a process pool. The logo is embedded: no network access is
+    needed to build the reports
+
+    :param directory: the directory of the html files, created if needed
+    :type directory: str
+    :param n_jobs: the number of worker processes, -1 for all the cores, defaults to None (sequential)
+    :type n_jobs: Optional[int]
+    :param executor: a process pool to build the reports on, instead of n_jobs
+    :type executor: Optional[Executor]
+    :param inline: embed BokehJS in every file instead of loading it from its CDN, defaults to False
+    :type inline: bool
+    :param return_timings: also return the time spent in each stage, defaults to False
+    :type return_timings: bool
+    :param kwargs: the parameters of plot
+    :return: the paths of the html files, one per numeric column, and the timings in seconds if
+    return_timings: the wall time of "statistics" and of "total", the time summed over the workers
+    of "layouts" and "html"
+    """
+    start = time.perf_counter()
+    os.makedirs(directory, exist_ok=True)
+
+    stats = report_statistics(self)
+    columns = list(stats["indicators"].columns)
+    timings = {"statistics": time.perf_counter() - start}
+
+    # a few chunks per worker, each pickled once with its columns and their statistics
+    n_chunks = 4 * (os.cpu_count() or 1) if executor is not None or n_jobs not in (None, 1) else 1
+    chunks = [chunk for chunk in np.array_split(np.arange(len(columns)), n_chunks) if len(chunk)]
+    tasks = [
+        (
+            [self[columns[i]] for i in chunk],
+            [column_stats(stats, columns[i]) for i in chunk],
+            directory,
+            inline,
+            kwargs,
+        )
+        for chunk in chunks
+    ]
+
+    if executor is not None:
+        results = _run(tasks, executor)
+    elif n_jobs is not None and n_jobs != 1:
+        max_workers = os.cpu_count() if n_jobs < 0 else n_jobs
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = _run(tasks, pool)
+    else:
+        results = [_render(*task) for task in tasks]
+
+    paths = [path for chunk_paths, _, _ in results for path in chunk_paths]
+    timings["layouts"] = sum(layout_time for _, layout_time, _ in results)
+    timings["html"] = sum(html_time for _, _, html_time in results)
+    timings["total"] = time.perf_counter() - start
+    logger.info(
+        f"{len(paths)} reports in {timings['total']:.2f}s: "
+        + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items())
+    )
+    return (paths, timings) if return_timings else paths
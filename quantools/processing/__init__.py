@@ -1,3 +1,5 @@
+from .diskcache import DiskCache
 from .fractionaldiff import FractionalDiff
+from .streaming import StreamingFractionalDiff
 
-__all__ = ["FractionalDiff"]
+__all__ = ["DiskCache", "FractionalDiff", "StreamingFractionalDiff"]
@@ -0,0 +1,124 @@
+from typing import Optional, Union
+
+import numpy as np
+
+# MacKinnon (1994) approximate p-values of the ADF statistic with a constant (regression="c", N=1),
+# the same surface statsmodels.tsa.adfvalues.mackinnonp uses
+_TAU_MAX, _TAU_MIN, _TAU_STAR = 2.74, -18.83, -1.61
+_TAU_SMALLP = np.array([2.1659, 1.4412, 0.038269])
+_TAU_LARGEP = np.array([1.7339, 0.93202, -0.12745, -0.010368])
+
+
+def mackinnon_pvalue(adfstat: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Vectorized MacKinnon approximate p-value of ADF statistics (constant, no trend)
+
+    :param adfstat: the ADF t-statistics
+    :type adfstat: Union[float, np.ndarray]
+    :return: the p-values
+    """
+    # imported on the first test, not with quantools
+    from scipy.special import ndtr
+
+    adfstat = np.asarray(adfstat, dtype=float)
+    pvalue = np.where(
+        adfstat <= _TAU_STAR,
+        ndtr(np.polyval(_TAU_SMALLP[::-1], adfstat)),
+        ndtr(np.polyval(_TAU_LARGEP[::-1], adfstat)),
+    )
+    pvalue = np.where(adfstat > _TAU_MAX, 1.0, pvalue)
+    return np.where(adfstat < _TAU_MIN, 0.0, pvalue)
+
+
+def _lagged_design(X: np.ndarray, maxlag: int, lag_first: bool = True) -> tuple:
+    # X is (nobs, n_series). Returns y = diff(X)[maxlag:] as (n_series, n) and the design
+    # (n_series, n, maxlag + 2): constant, level, then the lagged differences
+    # (the level is moved last when lag_first is False)
+    nobs = X.shape[0]
+    xdiff = np.diff(X, axis=0)
+    n = nobs - 1 - maxlag
+
+    design = np.empty((X.shape[1], n, maxlag + 2))
+    design[:, :, 0] = 1.0
+    level_col = 1 if lag_first else maxlag + 1
+    lag_offset = 2 if lag_first else 1
+    design[:, :, level_col] = X[maxlag : nobs - 1].T
+    for lag in range(1, maxlag + 1):
+        design[:, :, lag_offset + lag - 1] = xdiff[maxlag - lag : nobs - 1 - lag].T
+
+    return xdiff[maxlag:].T, design
+
+
+def _level_tstat(X: np.ndarray, lag: int) -> np.ndarray:
+    # t-statistic of the level coefficient of the ADF regression with `lag` lagged differences.
+    # With the level as the last column of the QR, its t-statistic is q_last * sign(R_last) / s.
+    y, design = _lagged_design(X, lag, lag_first=False)
+    Q, R = np.linalg.qr(design)
+    q = np.einsum("cnp,cn->cp", Q, y)
+    resid = y - np.einsum("cnp,cp->cn", Q, q)
+    dof = design.shape[1] - design.shape[2]
+    sigma = np.sqrt(np.einsum("cn,cn->c", resid, resid) / dof)
+    return q[:, -1] * np.sign(R[:, -1, -1]) / sigma
+
+
+def adfuller_pvalue(
+    X: np.ndarray, maxlag: Optional[int] = None, autolag: Optional[str] = "AIC"
+) -> Union[float, np.ndarray]:
+    """
+    Augmented Dickey-Fuller test with a constant, matching statsmodels.tsa.stattools.adfuller.
+    The lagged design matrix is built once and all the candidate lags are fitted from a single
+    QR decomposition. A 2D input tests every column at once.
+
+    :param X: 1D series, or 2D array with one series per column. Must not contain NaN
+    :type X: np.ndarray
+    :param maxlag: the maximum lag, defaults to None (12 * (nobs / 100) ** (1 / 4), as statsmodels)
+    :type maxlag: Optional[int]
+    :param autolag: "AIC" to select the lag on the Akaike criterion, None to use maxlag
+    :type autolag: Optional[str]
+    :return: the p-value, one per column for a 2D input
+    """
+    X = np.asarray(X, dtype=float)
+    squeeze = X.ndim == 1
+    if squeeze:
+        X = X[:, None]
+
+    nobs = X.shape[0]
+    if maxlag is None:
+        maxlag = min(nobs // 2 - 2, int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0))))
+        if maxlag < 0:
+            raise ValueError("sample size is too short to use selected regression component")
+    elif maxlag > nobs // 2 - 2:
+        raise ValueError("maxlag must be less than (nobs/2 - 2)")
+
+    if autolag is None:
+        adfstat = _level_tstat(X, maxlag)
+
+    elif autolag.lower() == "aic":
+        # nested fits on the common sample: with Q'y = q, the residual sum of squares of the model
+        # using the first k columns is ssr_full + sum(q[k:] ** 2)
+        y, design = _lagged_design(X, maxlag)
+        n = y.shape[1]
+        Q, _ = np.linalg.qr(design)
+        q = np.einsum("cnp,cn->cp", Q, y)
+        resid = y - np.einsum("cnp,cp->cn", Q, q)
+        ssr_full = np.einsum("cn,cn->c", resid, resid)
+        tail = np.cumsum((q**2)[:, ::-1], axis=1)[:, ::-1]  # tail[:, k] = sum(q[:, k:] ** 2)
+
+        n_params = np.arange(2, maxlag + 3)
+        ssr = ssr_full[:, None] + np.concatenate(
+            (tail[:, 2:], np.zeros((len(ssr_full), 1))), axis=1
+        )
+        with np.errstate(divide="ignore"):
+            llf = -n / 2 * (np.log(2 * np.pi) + np.log(ssr / n) + 1)
+        bestlag = np.argmin(-2 * llf + 2 * n_params, axis=1)
+
+        adfstat = np.empty(X.shape[1])
+        for lag in np.unique(bestlag):
+            cols = bestlag == lag
+            adfstat[cols] = _level_tstat(X[:, cols], int(lag))
+
+    else:
+        raise ValueError(f"Information Criterion {autolag} not understood.")
+
+    pvalue = mackinnon_pvalue(adfstat)
+    return float(pvalue[0]) if squeeze else pvalue
@@ -1,6 +1,103 @@
+from functools import lru_cache
+from typing import Optional, Union
+
+import numpy as np
 import pandas as pd
-from statsmodels.tsa.stattools import adfuller
 
+from ..utils.profiling import instrument
+from ._adf import adfuller_pvalue
+
+
+@instrument
+def adf_pvalue(X: Union[pd.Series, np.ndarray]) -> float:
+    if isinstance(X, np.ndarray):
+        X = pd.Series(X) if X.ndim == 1 else pd.DataFrame(X)
+    _X = X.dropna()
+    if len(_X) < 4:  # too short for the ADF regression
+        return 1.0
+    return float(np.max(adfuller_pvalue(np.asarray(_X, dtype=float))))
+
+
+@instrument
+def isStationnary(X: Union[pd.Series, np.ndarray], tol: float = 0.05):
+    return adf_pvalue(X) <= tol
+
+
+def _binomial_weights(
+    order: Union[float, int],
+    window_size: Optional[int] = None,
+    threshold: Optional[float] = None,
+) -> np.ndarray:
+    # recursive formula: w_0 = 1, w_k = -w_{k-1} * (order - k + 1) / k
+    weights = [1.0]
+    k = 1
+    while window_size is None or k < window_size:
+        w_k = -weights[-1] * (order - k + 1) / k
+        if threshold is not None and abs(w_k) < threshold:
+            break
+        weights.append(w_k)
+        k += 1
+
+    _weights = np.array(weights)
+    _weights.flags.writeable = False  # shared through the cache
+    return _weights
+
+
+@lru_cache(maxsize=1024)
+def frac_diff_weights(order: Union[float, int], window_size: int) -> np.ndarray:
+    """
+    Binomial weights of the fractional differencing operator (1 - B)^order, truncated to window_size
+
+    :param order: the order of differencing
+    :type order: Union[float, int]
+    :param window_size: the number of weights to keep
+    :type window_size: int
+    :return: the weights, weights[k] being applied to X[t - k]
+    """
+    if order == 1:
+        return _binomial_weights(order, window_size=2)
+    return _binomial_weights(order, window_size=window_size)
+
+
+@lru_cache(maxsize=1024)
+def ffd_weights(order: Union[float, int], threshold: float) -> np.ndarray:
+    """
+    Binomial weights of the fixed-width window fractional differencing (FFD):
+    the weights are kept until their absolute value drops below threshold
+
+    :param order: the order of differencing
+    :type order: Union[float, int]
+    :param threshold: the smallest absolute weight kept
+    :type threshold: float
+    :return: the weights, weights[k] being applied to X[t - k]
+    """
+    if threshold <= 0:
+        raise ValueError("The threshold must be positive")
+    return _binomial_weights(order, threshold=threshold)
+
+
+@instrument
+def frac_diff(X: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Applies the differencing weights to every column of X in a single vectorized pass.
+    Rows are time. The first len(weights) - 1 rows, and any row whose window contains a NaN, are NaN.
+
+    :param X: 1D or 2D array, one series per column
+    :type X: np.ndarray
+    :param weights: the weights, weights[k] being applied to X[t - k]
+    :type weights: np.ndarray
+    :return: the differenced array, with the same shape as X
+    """
+    X = np.asarray(X, dtype=float)
+    n_rows, window_size = X.shape[0], len(weights)
+    out = np.full(X.shape, np.nan)
+    if n_rows < window_size:
+        return out
 
-def isStationnary(X: pd.Series, tol: float = 0.05):
-    return adfuller(X.dropna())[1] <= tol
+    acc = out[window_size - 1 :]
+    np.multiply(X[window_size - 1 :], weights[0], out=acc)
+    buffer = np.empty_like(acc)
+    for k in range(1, window_size):
+        np.multiply(X[window_size - 1 - k : n_rows - k], weights[k], out=buffer)
+        acc += buffer
+    return out
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+
+
+class DiskCache:
+    """
+    A persistent cache of stationnarized columns, shared by the runs of a notebook or of a nightly job.
+    An entry holds the order of differencing and the differenced values of one column, keyed by a hash
+    of its values and of the differencing parameters. The least recently used entries are evicted once
+    the entries take more than max_bytes on disk.
+
+    When a column is not cached but its beginning is (the history has been appended to), the cached
+    order is reused and only the differenced values of the new rows are computed.
+
+    :param directory: the directory of the cache, created if needed
+    :type directory: str
+    :param max_bytes: the maximum size of the entries on disk, defaults to 1 GB
+    :type max_bytes: int
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(directory, "entries"), exist_ok=True)
+
+        self._index_path = os.path.join(directory, "index.json")
+        self._index: "OrderedDict[str, dict]" = OrderedDict()  # least recently used first
+        if os.path.exists(self._index_path):
+            with open(self._index_path) as f:
+                self._index.update(json.load(f))
+        self._nbytes = sum(entry["nbytes"] for entry in self._index.values())
+        # parameters -> length -> keys, to find the cached prefixes of a column without a scan
+        self._lengths: Dict[str, Dict[int, Set[str]]] = {}
+        for key, entry in self._index.items():
+            self._add_length(key, entry)
+
+    @staticmethod
+    def _key(values: np.ndarray, params: str) -> str:
+        digest = hashlib.blake2b(params.encode(), digest_size=16)
+        digest.update(np.ascontiguousarray(values, dtype=float).view(np.uint8))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, "entries", f"{key}.npy")
+
+    def get(
+        self, values: np.ndarray, params: tuple
+    ) -> Optional[Tuple[float, np.ndarray]]:
+        """
+        It looks up a column, or the longest cached beginning of it
+
+        :param values: the column
+        :type values: np.ndarray
+        :param params: the differencing parameters
+        :type params: tuple
+        :return: the order and the cached differenced values, which only cover the beginning of the
+        column after an append, or None
+        """
+        params_repr = repr(params)
+        key = self._key(values, params_repr)
+        if key not in self._index:
+            # append-only update: look for the longest cached prefix with the same parameters
+            lengths = self._lengths.get(params_repr, {})
+            key = next(
+                (
+                    prefix_key
+                    for n in sorted((n for n in lengths if n < len(values)), reverse=True)
+                    if (prefix_key := self._key(values[:n], params_repr)) in lengths[n]
+                ),
+                None,
+            )
+            if key is None:
+                return None
+
+        try:
+            diff = np.load(self._path(key))
+        except OSError:  # removed behind our back
+            self._remove(key)
+            return None
+        self._index.move_to_end(key)
+        return self._index[key]["order"], diff
+
+    def put(
+        self, values: np.ndarray, params: tuple, order: float, diff: np.ndarray
+    ) -> None:
+        """
+        It stores the order and the differenced values of a column, then evicts the least recently
+        used entries beyond max_bytes
+
+        :param values: the column
+        :type values: np.ndarray
+        :param params: the differencing parameters
+        :type params: tuple
+        :param order: the order of differencing
+        :type order: float
+        :param diff: the differenced column
+        :type diff: np.ndarray
+        """
+        params_repr = repr(params)
+        key = self._key(values, params_repr)
+        diff = np.asarray(diff, dtype=float)
+        np.save(self._path(key), diff)
+        if key in self._index:
+            self._nbytes -= self._index[key]["nbytes"]
+        self._index[key] = {
+            "order": float(order),
+            "n": len(values),
+            "params": params_repr,
+            "nbytes": diff.nbytes,
+        }
+        self._add_length(key, self._index[key])
+        self._index.move_to_end(key)
+        self._nbytes += diff.nbytes
+
+        while self._nbytes > self.max_bytes and self._index:
+            self._remove(next(iter(self._index)))
+
+    def _add_length(self, key: str, entry: dict) -> None:
+        self._lengths.setdefault(entry["params"], {}).setdefault(entry["n"], set()).add(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._index.pop(key)
+        self._nbytes -= entry["nbytes"]
+        lengths = self._lengths[entry["params"]]
+        lengths[entry["n"]].discard(key)
+        if not lengths[entry["n"]]:
+            del lengths[entry["n"]]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def flush(self) -> None:
+        """
+        It writes the index of the cache to disk
+        """
+        tmp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+
+    def clear(self) -> None:
+        """
+        It removes every entry of the cache
+        """
+        for key in list(self._index):
+            self._remove(key)
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
@@ -1,67 +1,392 @@
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
 from functools import partial
-from typing import List, Optional, Tuple, Union
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from scipy.special import binom
 
-from ._utils import isStationnary
+from ..utils.profiling import instrument
+from ._utils import adf_pvalue, ffd_weights, frac_diff, frac_diff_weights
 from .dataprocessor import DataProcessor
+from .diskcache import DiskCache
 
 import quantools as qt
 
+# (series fingerprint, differencing settings, order) -> ADF p-value, shared by every FractionalDiff
+_pvalue_cache: "OrderedDict[tuple, float]" = OrderedDict()
+_PVALUE_CACHE_SIZE = 100_000
+
+# (series fingerprint, differencing settings, precision) -> order found by the last search
+_order_cache: "OrderedDict[tuple, float]" = OrderedDict()
+_ORDER_CACHE_SIZE = 10_000
+
+
+def _cache_put(cache: OrderedDict, key: tuple, value: float, maxsize: int) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > maxsize:
+        cache.popitem(last=False)
+
+
+def _fingerprint(values: np.ndarray) -> bytes:
+    values = np.ascontiguousarray(values, dtype=float)
+    return hashlib.blake2b(values.view(np.uint8), digest_size=16).digest()
+
+
+def _autodiff_columns_worker(
+    shm_in: str,
+    shm_out: str,
+    shape: Tuple[int, int],
+    cols: Sequence[int],
+    precision: float,
+    method: str,
+    window_size: int,
+    threshold: float,
+    search: str,
+) -> List[float]:
+    # runs in a worker process: the panel is read from and written to shared memory
+    _shm_in, _shm_out = SharedMemory(name=shm_in), SharedMemory(name=shm_out)
+    try:
+        X = np.ndarray(shape, dtype=float, buffer=_shm_in.buf, order="F")
+        out = np.ndarray(shape, dtype=float, buffer=_shm_out.buf, order="F")
+        return FractionalDiff()._autodiff_columns(
+            X, out, cols, precision, method, window_size, threshold, search
+        )
+    finally:
+        _shm_in.close()
+        _shm_out.close()
+
 
 class FractionalDiff(DataProcessor):
     def __init__(self) -> None:
         super().__init__()
 
-        self.valid_method: List[str] = ["fixed-window"]
+        self.valid_method: List[str] = ["fixed-window", "ffd"]
 
+    @instrument
     def _diff(
-        self, X: pd.Series, order: Union[float, int], window_size: int = 10
-    ) -> pd.Series:
-
-        _X = X.copy(deep=True)
-        if order == 1:
-            _X = X - X.shift(int(order))
+        self,
+        X: Union[pd.Series, pd.DataFrame, np.ndarray],
+        order: Union[float, int],
+        window_size: int = 10,
+        method: str = "fixed-window",
+        threshold: float = 1e-5,
+    ) -> Union[pd.Series, pd.DataFrame, np.ndarray]:
 
-        else:
-            coeffs = (-1) ** np.arange(window_size) * binom(
-                order, np.arange(window_size)
-            )
-            D = partial(np.convolve, coeffs, mode="valid")
-            _X = _X.rolling(window_size).apply(D, raw=True)
+        weights = (
+            ffd_weights(order, threshold)
+            if method == "ffd"
+            else frac_diff_weights(order, window_size)
+        )
+        _X = frac_diff(X, weights)
 
+        if isinstance(X, pd.Series):
+            return X._constructor(_X, index=X.index, name=X.name)
+        if isinstance(X, pd.DataFrame):
+            return X._constructor(_X, index=X.index, columns=X.columns)
         return _X
 
-    def _autodiff(self, X: pd.Series, precision: float):
+    @instrument
+    def _autodiff(
+        self,
+        X: pd.Series,
+        precision: float,
+        method: str = "fixed-window",
+        window_size: int = 10,
+        threshold: float = 1e-5,
+        search: str = "bisection",
+        hint: Optional[float] = None,
+    ):
         """
-        It takes a series and a precision, and returns the differenced series and the order of differencing
+        It takes a series and a precision, and returns the differenced series and the order of differencing.
+        The orders tried are the midpoints of the bisection of [0, 4]: "bisection" tests them from the middle of
+        the interval, "warm" starts from the order hint (or the order found by a previous call on the same
+        series) and gallops away from it, which needs a couple of tests when the hint is close.
+        ADF p-values are memoized per (series fingerprint, order), so a repeated search runs no test.
 
         :param X: pd.Series
         :type X: pd.Series
         :param precision: the precision of the autodiff function
         :type precision: float
+        :param method: the differencing method, "fixed-window" or "ffd"
+        :type method: str
+        :param window_size: the number of weights of the "fixed-window" method
+        :type window_size: int
+        :param threshold: the smallest absolute weight kept by the "ffd" method
+        :type threshold: float
+        :param search: the order search, "bisection" or "warm"
+        :type search: str
+        :param hint: the expected order of differencing, for the "warm" search
+        :type hint: Optional[float]
         :return: The difference between the current value and the previous value.
         """
-        a, b = 0, 4
-        if isStationnary(X):
+        values = np.asarray(X, dtype=float)
+        settings = (
+            _fingerprint(values),
+            method,
+            threshold if method == "ffd" else window_size,
+        )
+
+        def is_valid(order: float) -> bool:
+            key = (*settings, order)
+            pvalue = _pvalue_cache.get(key)
+            if pvalue is None:
+                pvalue = adf_pvalue(
+                    self._diff(values, order, window_size, method, threshold)
+                    if order
+                    else values
+                )
+            _cache_put(_pvalue_cache, key, pvalue, _PVALUE_CACHE_SIZE)
+            return pvalue <= 0.05
+
+        if is_valid(0):
             return X, 0
-        _valid = []
-        while b - a >= precision:
-            mid = (b + a) / 2
-            _X = X.copy(deep=True)
-            if isStationnary((diff_serie := self._diff(_X, order=mid))):
-                _valid.append((diff_serie, mid))
-                # print(f"Found a valid order of differencing: {mid}")
-                b = mid
+
+        # orders are multiples of the finest bisection step, the bracket being [lo, hi] * step
+        n_steps = 1
+        while 4 / n_steps >= precision:
+            n_steps *= 2
+        step = 4 / n_steps
+        lo, hi = 0, n_steps  # order 0 is not valid, order 4 is never tested
+
+        if search == "warm":
+            hint = _order_cache.get((*settings, precision), hint)
+        if search == "warm" and hint is not None and n_steps > 1:
+            guess = min(max(int(np.ceil(hint / step)), 1), n_steps - 1)
+            gallop = 1
+            if is_valid(guess * step):
+                hi = guess
+                while hi - gallop > 0 and is_valid((hi - gallop) * step):
+                    hi, gallop = hi - gallop, 2 * gallop
+                lo = max(hi - gallop, 0)
             else:
-                # print(f"Order of differencing {mid} is not valid")
-                a = mid
+                lo = guess
+                while lo + gallop < n_steps and not is_valid((lo + gallop) * step):
+                    lo, gallop = lo + gallop, 2 * gallop
+                hi = min(lo + gallop, n_steps)
 
-        if not _valid:
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if is_valid(mid * step):
+                hi = mid
+            else:
+                lo = mid
+
+        if hi == n_steps:
             raise ValueError("Could not find a valid order of differencing")
-        return _valid[-1]
+
+        order = hi * step
+        _cache_put(_order_cache, (*settings, precision), order, _ORDER_CACHE_SIZE)
+        return self._diff(X, order, window_size, method, threshold), order
+
+    def _autodiff_columns(
+        self,
+        X: np.ndarray,
+        out: np.ndarray,
+        cols: Sequence[int],
+        precision: float,
+        method: str = "fixed-window",
+        window_size: int = 10,
+        threshold: float = 1e-5,
+        search: str = "bisection",
+    ) -> List[float]:
+        orders = []
+        for i, col in enumerate(cols):
+            hint = None
+            if search == "warm" and i > 0:
+                # warm start from the previous column when the increments are correlated
+                previous = pd.Series(np.diff(X[:, cols[i - 1]]))
+                if previous.corr(pd.Series(np.diff(X[:, col]))) >= 0.5:
+                    hint = orders[-1]
+
+            X_diff, order = self._autodiff(
+                pd.Series(X[:, col]),
+                precision,
+                method,
+                window_size,
+                threshold,
+                search,
+                hint,
+            )
+            out[:, col] = X_diff
+            orders.append(order)
+        return orders
+
+    def _parallel_autodiff(
+        self,
+        X: np.ndarray,
+        precision: float,
+        method: str,
+        window_size: int,
+        threshold: float,
+        search: str,
+        executor: Executor,
+        n_tasks: int,
+    ) -> Tuple[np.ndarray, List[float]]:
+        """
+        Runs the per-column order searches on an executor. The panel is shared with the workers
+        through shared memory, and they write the differenced columns in a single shared output block.
+
+        :param X: 2D array, one series per column
+        :type X: np.ndarray
+        :param executor: a process pool
+        :type executor: Executor
+        :param n_tasks: the number of column chunks sent to the executor
+        :type n_tasks: int
+        :return: The differenced array and the orders of differencing
+        """
+        shape = X.shape
+        nbytes = max(X.size * np.dtype(float).itemsize, 1)
+        shm_in, shm_out = SharedMemory(create=True, size=nbytes), SharedMemory(
+            create=True, size=nbytes
+        )
+        try:
+            np.ndarray(shape, dtype=float, buffer=shm_in.buf, order="F")[:] = X
+            chunks = [
+                chunk.tolist()
+                for chunk in np.array_split(np.arange(shape[1]), n_tasks)
+                if len(chunk)
+            ]
+            futures = [
+                executor.submit(
+                    _autodiff_columns_worker,
+                    shm_in.name,
+                    shm_out.name,
+                    shape,
+                    chunk,
+                    precision,
+                    method,
+                    window_size,
+                    threshold,
+                    search,
+                )
+                for chunk in chunks
+            ]
+            orders = [order for future in futures for order in future.result()]
+            X_diff = np.array(
+                np.ndarray(shape, dtype=float, buffer=shm_out.buf, order="F")
+            )
+        finally:
+            for shm in (shm_in, shm_out):
+                shm.close()
+                shm.unlink()
+
+        return X_diff, orders
+
+    @instrument
+    def _search_columns(
+        self,
+        X: np.ndarray,
+        precision: float,
+        method: str,
+        window_size: int,
+        threshold: float,
+        search: str,
+        n_jobs: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> Tuple[np.ndarray, List[float]]:
+        # the order search of every column of X, sequential or on a process pool
+        if executor is not None:
+            return self._parallel_autodiff(
+                X,
+                precision,
+                method,
+                window_size,
+                threshold,
+                search,
+                executor,
+                n_tasks=4 * (os.cpu_count() or 1),
+            )
+        if n_jobs is not None and n_jobs != 1:
+            max_workers = os.cpu_count() if n_jobs < 0 else n_jobs
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                return self._parallel_autodiff(
+                    X,
+                    precision,
+                    method,
+                    window_size,
+                    threshold,
+                    search,
+                    pool,
+                    n_tasks=4 * max_workers,  # type: ignore
+                )
+
+        X_diff = np.empty(X.shape, order="F")
+        orders = self._autodiff_columns(
+            X,
+            X_diff,
+            range(X.shape[1]),
+            precision,
+            method,
+            window_size,
+            threshold,
+            search,
+        )
+        return X_diff, orders
+
+    @instrument
+    def _cached_autodiff(
+        self,
+        X: np.ndarray,
+        cache: DiskCache,
+        precision: float,
+        method: str,
+        window_size: int,
+        threshold: float,
+        search_columns,
+    ) -> Tuple[np.ndarray, List[float]]:
+        """
+        Runs the order search only on the columns missing from the disk cache. A column whose beginning
+        is cached keeps the cached order, and only its new rows are differenced.
+
+        :param X: 2D array, one series per column
+        :type X: np.ndarray
+        :param cache: the disk cache
+        :type cache: DiskCache
+        :param search_columns: the function searching the orders of a 2D array, returning the
+        differenced array and the orders
+        :return: The differenced array and the orders of differencing
+        """
+        params = (method, precision, threshold if method == "ffd" else window_size)
+        X_diff = np.empty(X.shape, order="F")
+        orders: List[float] = [0.0] * X.shape[1]
+
+        missing = []
+        for col in range(X.shape[1]):
+            hit = cache.get(X[:, col], params)
+            if hit is None:
+                missing.append(col)
+                continue
+            orders[col], cached = hit
+            n = len(cached)
+            X_diff[:n, col] = cached
+            if n < len(X) and orders[col]:
+                # the new rows only need the last len(weights) - 1 rows of the history
+                weights = (
+                    ffd_weights(orders[col], threshold)
+                    if method == "ffd"
+                    else frac_diff_weights(orders[col], window_size)
+                )
+                start = max(n - len(weights) + 1, 0)
+                X_diff[n:, col] = frac_diff(X[start:, col], weights)[n - start :]
+            elif n < len(X):
+                X_diff[n:, col] = X[n:, col]
+            if n < len(X):
+                cache.put(X[:, col], params, orders[col], X_diff[:, col])
+
+        if missing:
+            missing_diff, missing_orders = search_columns(np.asfortranarray(X[:, missing]))
+            X_diff[:, missing] = missing_diff
+            for i, col in enumerate(missing):
+                orders[col] = missing_orders[i]
+                cache.put(X[:, col], params, missing_orders[i], X_diff[:, col])
+
+        cache.flush()
+        return X_diff, orders
 
     def _1D_diff(
         self,
@@ -69,56 +394,173 @@ class FractionalDiff(DataProcessor):
         precision: float,
         method: str = "fixed-window",
         order: Optional[Union[float, int]] = None,
+        window_size: int = 10,
+        threshold: float = 1e-5,
+        search: str = "bisection",
     ):
         if order is not None:
-            return self._diff(X, order=order), order
+            return self._diff(X, order, window_size, method, threshold), order
 
         else:
-            return self._autodiff(X, precision=precision)
+            return self._autodiff(X, precision, method, window_size, threshold, search)
 
+    @instrument
     def __call__(
         self,
-        X: Union[pd.Series, pd.DataFrame],
+        X: Union[pd.Series, pd.DataFrame, np.ndarray],
         precision: float = 0.1,
         method: str = "fixed-window",
         order: Optional[Union[float, int]] = None,
         return_order: bool = False,
         rename: bool = True,
+        window_size: int = 10,
+        threshold: float = 1e-5,
+        n_jobs: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        search: str = "bisection",
+        cache: Optional[Union[str, DiskCache]] = None,
     ) -> Union[
         Tuple[Union[pd.Series, pd.DataFrame], List[float]],
         Union[pd.Series, pd.DataFrame],
     ]:
+        """
+        Fractionally differences every column of X, searching the smallest order that makes it
+        stationnary unless an order is given
+
+        :param X: the series to difference, one per column
+        :type X: Union[pd.Series, pd.DataFrame, np.ndarray]
+        :param precision: the precision of the order search
+        :type precision: float
+        :param method: the differencing method, "fixed-window" or "ffd"
+        :type method: str
+        :param order: a fixed order of differencing, defaults to None (searched per column)
+        :type order: Optional[Union[float, int]]
+        :param return_order: also return the orders of differencing, defaults to False
+        :type return_order: bool
+        :param rename: suffix the columns with "_stationnarized", defaults to True
+        :type rename: bool
+        :param window_size: the number of weights of the "fixed-window" method
+        :type window_size: int
+        :param threshold: the smallest absolute weight kept by the "ffd" method
+        :type threshold: float
+        :param n_jobs: the number of worker processes of the order search, -1 for all the cores,
+        defaults to None (sequential)
+        :type n_jobs: Optional[int]
+        :param executor: a process pool to run the order search on, instead of n_jobs
+        :type executor: Optional[Executor]
+        :param search: the order search, "bisection" or "warm" (starts from the order found on the previous
+        column when they are correlated, or from a previous call on the same series)
+        :type search: str
+        :param cache: a DiskCache, or its directory, keeping the orders and differenced columns found by
+        the order search across runs, defaults to None
+        :type cache: Optional[Union[str, DiskCache]]
+        :return: The differenced series, and the orders of differencing if return_order
+        """
         assert method in self.valid_method, ValueError(
             f"The method must be in {self.valid_method}"
         )
 
         assert order is None or order > 0, ValueError("The order must be positive")
 
-        if (isinstance(X, (pd.DataFrame, qt.Table))) and X.shape[1] > 1:
+        assert search in ["bisection", "warm"], ValueError(
+            "The search must be in ['bisection', 'warm']"
+        )
+
+        if isinstance(cache, str):
+            cache = DiskCache(cache)
+
+        if isinstance(X, np.ndarray):
+            _X = X.reshape(len(X), -1)
+            X_diff, orders = self(
+                pd.DataFrame(_X) if _X.shape[1] > 1 else pd.Series(_X[:, 0]),
+                precision,
+                method,
+                order,
+                return_order=True,
+                rename=False,
+                window_size=window_size,
+                threshold=threshold,
+                n_jobs=n_jobs,
+                executor=executor,
+                search=search,
+                cache=cache,
+            )
+            X_diff = X_diff.to_numpy().reshape(X.shape)
+
+        elif (isinstance(X, (pd.DataFrame, qt.Table))) and X.shape[1] > 1:
             cols_name = (
                 [f"{el}_stationnarized" for el in X.columns] if rename else X.columns
             )
-            X_diff = None
-            orders = None
-            for col in range(X.shape[1]):
-                X_diff_, order_ = self._1D_diff(
-                    X.iloc[:, col], precision, method, order
-                )
-                if X_diff is None or orders is None:
-                    X_diff = X_diff_
-                    orders = [order_]
-                else:
-                    X_diff = pd.concat((X_diff, X_diff_), axis=1)
-                    orders.append(order_)
-
-            if X_diff is not None:
+            if order is not None:
+                # a single vectorized pass over all the columns
+                X_diff = self._diff(X, order, window_size, method, threshold)
                 X_diff.columns = cols_name
+                return (X_diff, [order] * X.shape[1]) if return_order else X_diff
+
+            values = X.to_numpy(dtype=float)
+            search_columns = partial(
+                self._search_columns,
+                precision=precision,
+                method=method,
+                window_size=window_size,
+                threshold=threshold,
+                search=search,
+                n_jobs=n_jobs,
+                executor=executor,
+            )
+            if cache is not None:
+                diff_values, orders = self._cached_autodiff(
+                    values,
+                    cache,
+                    precision,
+                    method,
+                    window_size,
+                    threshold,
+                    search_columns,
+                )
+            else:
+                diff_values, orders = search_columns(values)
+
+            X_diff = X._constructor(diff_values, index=X.index, columns=cols_name)
+
+        elif (
+            order is None
+            and cache is not None
+            and isinstance(X, (pd.Series, pd.DataFrame))
+            and (X.ndim == 1 or X.shape[1] == 1)
+        ):
+            # a series, or a table with a single column, which _1D_diff would not cache
+            diff_values, orders = self._cached_autodiff(
+                X.to_numpy(dtype=float).reshape(len(X), -1),
+                cache,
+                precision,
+                method,
+                window_size,
+                threshold,
+                partial(
+                    self._search_columns,
+                    precision=precision,
+                    method=method,
+                    window_size=window_size,
+                    threshold=threshold,
+                    search=search,
+                ),
+            )
+            X_diff = (
+                X._constructor(diff_values[:, 0], index=X.index, name=X.name)
+                if X.ndim == 1
+                else X._constructor(diff_values, index=X.index, columns=X.columns)
+            )
 
         elif isinstance(X, (pd.Series, qt.TableSeries, qt.Table)):
-            X_diff, orders = self._1D_diff(X, precision, method, order)
+            X_diff, orders = self._1D_diff(
+                X, precision, method, order, window_size, threshold, search
+            )
             orders = [orders]
 
         else:
-            raise ValueError("The input must be a pd.Series or a pd.DataFrame")
+            raise ValueError(
+                "The input must be a pd.Series, a pd.DataFrame or a np.ndarray"
+            )
 
         return (X_diff, orders) if return_order else X_diff  # type: ignore
@@ -0,0 +1,98 @@
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ._utils import ffd_weights, frac_diff, frac_diff_weights
+from .dataprocessor import DataProcessor
+
+
+class StreamingFractionalDiff(DataProcessor):
+    """
+    Fractional differencing of live bars. It keeps a ring buffer of the last window_size - 1 rows of
+    every column, so each update costs O(window_size * columns) and returns exactly the values the
+    batch FractionalDiff()._diff would give on the whole history.
+
+    :param order: the order of differencing
+    :type order: Union[float, int]
+    :param method: the differencing method, "fixed-window" or "ffd"
+    :type method: str
+    :param window_size: the number of weights of the "fixed-window" method
+    :type window_size: int
+    :param threshold: the smallest absolute weight kept by the "ffd" method
+    :type threshold: float
+    """
+
+    def __init__(
+        self,
+        order: Union[float, int],
+        method: str = "fixed-window",
+        window_size: int = 10,
+        threshold: float = 1e-5,
+    ) -> None:
+        super().__init__()
+
+        if method not in ["fixed-window", "ffd"]:
+            raise ValueError("The method must be in ['fixed-window', 'ffd']")
+
+        self.order = order
+        self.weights = (
+            ffd_weights(order, threshold)
+            if method == "ffd"
+            else frac_diff_weights(order, window_size)
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        self._buffer: Optional[np.ndarray] = None  # (len(weights) - 1, n_columns)
+        self._position = 0  # slot of the oldest row of the buffer
+
+    def _history(self) -> np.ndarray:
+        # the buffered rows, oldest first
+        size = len(self._buffer)  # type: ignore
+        return self._buffer[(self._position + np.arange(size)) % size]  # type: ignore
+
+    def update(
+        self, new_rows: Union[pd.Series, pd.DataFrame, np.ndarray]
+    ) -> Union[pd.Series, pd.DataFrame, np.ndarray]:
+        """
+        Differences a batch of new rows, given everything seen before
+
+        :param new_rows: the new rows, one column per series. A pd.Series is a single new row
+        :type new_rows: Union[pd.Series, pd.DataFrame, np.ndarray]
+        :return: the differenced rows, with the same type, index and columns as new_rows
+        """
+        values = np.asarray(new_rows, dtype=float)
+        squeeze = values.ndim == 1
+        values = values.reshape(1, -1) if squeeze else values
+        n_rows, n_cols = values.shape
+
+        size = len(self.weights) - 1
+        if self._buffer is None:
+            # nothing seen yet: the missing history gives NaN, like the first rows of the batch
+            self._buffer = np.full((size, n_cols), np.nan)
+        elif self._buffer.shape[1] != n_cols:
+            raise ValueError(
+                f"Expected {self._buffer.shape[1]} columns, got {n_cols} columns"
+            )
+
+        block = np.concatenate((self._history(), values)) if size else values
+        out = frac_diff(block, self.weights)[size:]
+
+        # only the last `size` rows are kept
+        kept = min(n_rows, size)
+        if kept:
+            slots = (self._position + n_rows - kept + np.arange(kept)) % size
+            self._buffer[slots] = values[n_rows - kept :]
+            self._position = (self._position + n_rows) % size
+
+        if isinstance(new_rows, pd.DataFrame):
+            return new_rows._constructor(out, index=new_rows.index, columns=new_rows.columns)
+        if isinstance(new_rows, pd.Series):
+            return new_rows._constructor(out[0], index=new_rows.index, name=new_rows.name)
+        return out[0] if squeeze else out
+
+    def __call__(
+        self, new_rows: Union[pd.Series, pd.DataFrame, np.ndarray]
+    ) -> Union[pd.Series, pd.DataFrame, np.ndarray]:
+        return self.update(new_rows)
@@ -1,3 +1,4 @@
+from ._lazy import LazyTable
 from ._table import Table, TableSeries
 
-__all__ = ["Table", "TableSeries"]
\ No newline at end of file
+__all__ = ["LazyTable", "Table", "TableSeries"]
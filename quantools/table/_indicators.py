@@ -0,0 +1,362 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# !!!! uses ddof=0 in std calculation, as the Table methods
+
+
+def indicators_kernel(values: np.ndarray, risk_free: float = 0) -> Dict[str, np.ndarray]:
+    """
+    Computes sharpe, sortino, calmar and max_drawdown of every column of a daily returns array at once,
+    with the same conventions (and NaN handling) as the Table methods
+
+    :param values: 2D array of daily returns, one column per series
+    :type values: np.ndarray
+    :param risk_free: the risk free rate, defaults to 0
+    :type risk_free: float (optional)
+    :return: a dict indicator name -> array with one value per column
+    """
+    values = np.ascontiguousarray(values, dtype=float)
+    mask = ~np.isnan(values)
+    has_nan = not mask.all()
+    returns = np.where(mask, values, 0.0) if has_nan else values
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = mask.sum(axis=0)
+        mean = returns.sum(axis=0) / n
+        centered = returns - mean
+        if has_nan:
+            centered[~mask] = 0
+        std = np.sqrt(np.einsum("ij,ij->j", centered, centered) / n)
+
+        negative = np.minimum(returns, 0)
+        n_neg = np.count_nonzero(negative, axis=0)
+        mean_neg = negative.sum(axis=0) / n_neg
+        std_neg = np.sqrt(
+            np.maximum(np.einsum("ij,ij->j", negative, negative) / n_neg - mean_neg**2, 0)
+        )
+
+        # NaN returns leave the cumulative price unchanged and are skipped by the max
+        price = returns + 1
+        np.cumprod(price, axis=0, out=price)
+        if has_nan:
+            price[~mask] = -np.inf
+        drawdowns = np.maximum.accumulate(price, axis=0)
+        drawdowns -= price
+        if has_nan:
+            drawdowns[~mask] = -np.inf
+        max_drawdown = drawdowns.max(axis=0, initial=-np.inf)
+        max_drawdown = np.where(n > 0, max_drawdown, np.nan)
+
+        return _ratios(mean, std, std_neg, max_drawdown, risk_free)
+
+
+def _ratios(mean, std, std_neg, max_drawdown, risk_free) -> Dict[str, np.ndarray]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "sharpe": (mean * 252 - risk_free) / (std * np.sqrt(252)),
+            "sortino": (mean * 252 - risk_free) / (std_neg * np.sqrt(252)),
+            "calmar": (mean - risk_free) / np.abs(max_drawdown),
+            "max_drawdown": max_drawdown,
+        }
+
+
+def _prefix_sums(values: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+    # running sums with a leading row of zeros: the sum over rows a..b is prefix[b + 1] - prefix[a].
+    # Also returns the cumulative price (NaN returns leave it unchanged) and the mask of valid rows.
+    values = np.asarray(values, dtype=float)
+    mask = ~np.isnan(values)
+    returns = np.where(mask, values, 0.0)
+    negative = np.minimum(returns, 0)
+
+    terms = {
+        "n": mask,
+        "sum": returns,
+        "sum_sq": returns**2,
+        "n_neg": negative < 0,
+        "sum_neg": negative,
+        "sum_sq_neg": negative**2,
+    }
+    prefix = {}
+    for name, term in terms.items():
+        prefix[name] = np.zeros((len(values) + 1, values.shape[1]))
+        np.cumsum(term, axis=0, out=prefix[name][1:])
+
+    price = returns + 1
+    np.cumprod(price, axis=0, out=price)
+    return prefix, price, mask
+
+
+def _range_moments(
+    prefix: Dict[str, np.ndarray], starts: np.ndarray, ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # mean, std, downside std and number of observations over the rows starts..ends (inclusive)
+    sums = {name: prefix[name][ends + 1] - prefix[name][starts] for name in prefix}
+
+    def _std(sum_, sum_sq, n, total_sq):
+        # variances below the rounding error of the running sums (e.g. a single observation) are 0
+        var = sum_sq / n - (sum_ / n) ** 2
+        var = np.where(var > 16 * np.finfo(float).eps * total_sq / n, var, 0)
+        return np.where(n > 0, np.sqrt(var), np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = sums["sum"] / sums["n"]
+        std = _std(sums["sum"], sums["sum_sq"], sums["n"], prefix["sum_sq"][ends + 1])
+        std_neg = _std(
+            sums["sum_neg"],
+            sums["sum_sq_neg"],
+            sums["n_neg"],
+            prefix["sum_sq_neg"][ends + 1],
+        )
+    return mean, std, std_neg, sums["n"]
+
+
+def _block_scans(price: np.ndarray, mask: np.ndarray, size: int) -> Dict[str, np.ndarray]:
+    # Within consecutive blocks of `size` rows, aggregates of the (max, min, max drawdown) monoid
+    # from the block start up to each row (prefix) and from each row to the block end (suffix).
+    # The max drawdown of a segment is max(P_u - P_t) for u <= t, and
+    # (max, min, mdd)(L + R) = (max(max_L, max_R), min(min_L, min_R), max(mdd_L, mdd_R, max_L - min_R)).
+    n_rows, n_cols = price.shape
+    n_blocks = -(-n_rows // size)
+    high = np.full((n_blocks * size, n_cols), -np.inf)
+    high[:n_rows] = np.where(mask, price, -np.inf)  # invalid rows are skipped
+    low = np.full((n_blocks * size, n_cols), np.inf)
+    low[:n_rows] = np.where(mask, price, np.inf)
+    high, low = high.reshape(n_blocks, size, n_cols), low.reshape(n_blocks, size, n_cols)
+
+    max_p = np.maximum.accumulate(high, axis=1)
+    min_p = np.minimum.accumulate(low, axis=1)
+    mdd_p = np.maximum.accumulate(max_p - low, axis=1)
+
+    max_s = np.maximum.accumulate(high[:, ::-1], axis=1)[:, ::-1]
+    min_s = np.minimum.accumulate(low[:, ::-1], axis=1)[:, ::-1]
+    mdd_s = np.maximum.accumulate((high - min_s)[:, ::-1], axis=1)[:, ::-1]
+
+    shape = (n_blocks * size, n_cols)
+    return {
+        "max_p": max_p.reshape(shape),
+        "min_p": min_p.reshape(shape),
+        "mdd_p": mdd_p.reshape(shape),
+        "max_s": max_s.reshape(shape),
+        "mdd_s": mdd_s.reshape(shape),
+    }
+
+
+def _rolling_max_drawdown(
+    price: np.ndarray, mask: np.ndarray, window: int, ends: np.ndarray
+) -> np.ndarray:
+    # van Herk / Gil-Werman: a window of `window` rows is the suffix of one block of `window` rows
+    # followed by the prefix of the next one, so every window is answered in O(1)
+    scans = _block_scans(price, mask, window)
+    starts = ends - window + 1
+
+    mdd = np.maximum(scans["mdd_s"][starts], scans["mdd_p"][ends])
+    mdd = np.maximum(mdd, scans["max_s"][starts] - scans["min_p"][ends])
+    aligned = starts % window == 0  # the window is exactly one block
+    mdd[aligned] = scans["mdd_p"][ends[aligned]]
+
+    # drawdowns are measured on the price rebased at the start of the window
+    base = np.vstack((np.ones((1, price.shape[1])), price))[starts]
+    return mdd / base
+
+
+def rolling_indicators_kernel(
+    values: np.ndarray,
+    window: int,
+    step: int = 1,
+    risk_free: float = 0,
+    expanding: bool = False,
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Rolling (or expanding) sharpe, sortino, calmar and max_drawdown of every column of a daily returns
+    array, in O(n) per column: running sums and sums of squares for the moments, and block prefix/suffix
+    scans for the drawdown
+
+    :param values: 2D array of daily returns, one column per series
+    :type values: np.ndarray
+    :param window: the number of rows of each window (the minimum number of rows when expanding)
+    :type window: int
+    :param step: the number of rows between two window ends, defaults to 1
+    :type step: int (optional)
+    :param risk_free: the risk free rate, defaults to 0
+    :type risk_free: float (optional)
+    :param expanding: all the windows start at the first row, defaults to False
+    :type expanding: bool (optional)
+    :return: the row of each window end and a dict indicator name -> (n_windows, n_columns) array
+    """
+    if window < 1 or step < 1:
+        raise ValueError("window and step must be positive")
+
+    values = np.asarray(values, dtype=float)
+    ends = np.arange(window - 1, len(values), step)
+    prefix, price, mask = _prefix_sums(values)
+
+    if expanding:
+        starts = np.zeros_like(ends)
+        high = np.where(mask, price, -np.inf)
+        drawdowns = np.maximum.accumulate(high, axis=0) - np.where(mask, price, np.inf)
+        max_drawdown = np.maximum.accumulate(drawdowns, axis=0)[ends]
+    else:
+        starts = ends - window + 1
+        max_drawdown = _rolling_max_drawdown(price, mask, window, ends)
+
+    mean, std, std_neg, n = _range_moments(prefix, starts, ends)
+    max_drawdown = np.where(n > 0, max_drawdown, np.nan)
+    return ends, _ratios(mean, std, std_neg, max_drawdown, risk_free)
+
+
+def _range_max_drawdown(
+    price: np.ndarray,
+    mask: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    max_nodes: int = 2**23,
+) -> np.ndarray:
+    # Segment tree of the (max, min, max drawdown) monoid, queried bottom-up for all the ranges at once.
+    # Built on blocks of columns so that it holds at most max_nodes values per array.
+    n_rows, n_cols = price.shape
+    size = 1
+    while size < n_rows:
+        size *= 2
+    block = max(max_nodes // (2 * size), 1)
+    result = np.empty((len(starts), n_cols))
+
+    for first in range(0, n_cols, block):
+        cols = slice(first, first + block)
+        width = min(block, n_cols - first)
+
+        high = np.full((2 * size, width), -np.inf)
+        low = np.full((2 * size, width), np.inf)
+        mdd = np.full((2 * size, width), -np.inf)
+        high[size : size + n_rows] = np.where(mask[:, cols], price[:, cols], -np.inf)
+        low[size : size + n_rows] = np.where(mask[:, cols], price[:, cols], np.inf)
+        mdd[size : size + n_rows] = np.where(mask[:, cols], 0, -np.inf)
+        level = size // 2
+        while level:
+            nodes = np.arange(level, 2 * level)
+            left, right = 2 * nodes, 2 * nodes + 1
+            high[nodes] = np.maximum(high[left], high[right])
+            low[nodes] = np.minimum(low[left], low[right])
+            mdd[nodes] = np.maximum(
+                np.maximum(mdd[left], mdd[right]), high[left] - low[right]
+            )
+            level //= 2
+
+        # left and right accumulators, combined in time order
+        acc = {
+            side: [
+                np.full((len(starts), width), -np.inf),
+                np.full((len(starts), width), np.inf),
+                np.full((len(starts), width), -np.inf),
+            ]
+            for side in ("left", "right")
+        }
+        left_node, right_node = starts + size, ends + size + 1
+        while np.any(left_node < right_node):
+            active = left_node < right_node
+            take = active & (left_node % 2 == 1)
+            if take.any():
+                h, l_, m = acc["left"]
+                node = left_node[take]
+                m[take] = np.maximum(
+                    np.maximum(m[take], mdd[node]), h[take] - low[node]
+                )
+                h[take] = np.maximum(h[take], high[node])
+                l_[take] = np.minimum(l_[take], low[node])
+                left_node = np.where(take, left_node + 1, left_node)
+
+            take = active & (right_node % 2 == 1)
+            if take.any():
+                right_node = np.where(take, right_node - 1, right_node)
+                h, l_, m = acc["right"]
+                node = right_node[take]
+                m[take] = np.maximum(
+                    np.maximum(mdd[node], m[take]), high[node] - l_[take]
+                )
+                h[take] = np.maximum(high[node], h[take])
+                l_[take] = np.minimum(low[node], l_[take])
+
+            left_node, right_node = left_node // 2, right_node // 2
+
+        h_left, _, m_left = acc["left"]
+        _, l_right, m_right = acc["right"]
+        result[:, cols] = np.maximum(np.maximum(m_left, m_right), h_left - l_right)
+
+    # drawdowns are measured on the price rebased at the start of the range
+    base = np.vstack((np.ones((1, n_cols)), price))[starts]
+    return result / base
+
+
+def range_indicators_kernel(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray, risk_free: float = 0
+) -> Dict[str, np.ndarray]:
+    """
+    Sharpe, sortino, calmar and max_drawdown of every column of a daily returns array over many ranges
+    of rows. Prefix sums answer the moments of each range in O(1), and a segment tree the max drawdown
+    in O(log n)
+
+    :param values: 2D array of daily returns, one column per series
+    :type values: np.ndarray
+    :param starts: the first row of each range
+    :type starts: np.ndarray
+    :param ends: the last row of each range (inclusive)
+    :type ends: np.ndarray
+    :param risk_free: the risk free rate, defaults to 0
+    :type risk_free: float (optional)
+    :return: a dict indicator name -> (n_ranges, n_columns) array
+    """
+    values = np.asarray(values, dtype=float)
+    starts, ends = np.asarray(starts, dtype=int), np.asarray(ends, dtype=int)
+    if np.any(starts < 0) or np.any(ends >= len(values)) or np.any(starts > ends):
+        raise ValueError("The ranges must be non empty and within the rows of values")
+
+    prefix, price, mask = _prefix_sums(values)
+    mean, std, std_neg, n = _range_moments(prefix, starts, ends)
+    max_drawdown = _range_max_drawdown(price, mask, starts, ends)
+    max_drawdown = np.where(n > 0, max_drawdown, np.nan)
+    return _ratios(mean, std, std_neg, max_drawdown, risk_free)
+
+
+def bootstrap_indices(
+    n_rows: int,
+    n_resamples: int,
+    block_size: int,
+    method: str = "stationary",
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Row indices of block bootstrap resamples, all generated at once. The circular bootstrap joins
+    blocks of block_size rows starting at uniform positions, wrapping around the end. The stationary
+    bootstrap (Politis and Romano) starts a new block at each row with probability 1 / block_size, so
+    that the block lengths are geometric with mean block_size
+
+    :param n_rows: the number of rows of the series, and of each resample
+    :type n_rows: int
+    :param n_resamples: the number of resamples
+    :type n_resamples: int
+    :param block_size: the (mean) length of the blocks
+    :type block_size: int
+    :param method: "stationary" or "circular", defaults to "stationary"
+    :type method: str
+    :param rng: the random generator, defaults to None (a fresh one)
+    :type rng: Optional[np.random.Generator]
+    :return: a (n_rows, n_resamples) array of row indices
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    rows = np.arange(n_rows)[:, None]
+
+    if method == "circular":
+        n_blocks = -(-n_rows // block_size)
+        starts = rng.integers(0, n_rows, (n_blocks, n_resamples))
+        block_start = np.repeat(starts, block_size, axis=0)[:n_rows]
+        return (block_start + rows % block_size) % n_rows
+
+    if method == "stationary":
+        new_block = rng.random((n_rows, n_resamples)) < 1 / block_size
+        new_block[0] = True
+        starts = rng.integers(0, n_rows, (n_rows, n_resamples))
+        # the row at which the current block started, and the position it started from
+        first = np.maximum.accumulate(np.where(new_block, rows, 0), axis=0)
+        return (np.take_along_axis(starts, first, axis=0) + rows - first) % n_rows
+
+    raise ValueError(f"The method must be in ['stationary', 'circular'], not {method}")
@@ -0,0 +1,349 @@
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+import quantools as qt
+
+from ..processing._utils import ffd_weights, frac_diff_weights
+from ._storage import __binary_filetype__, create_npy, open_npy
+
+# the working memory of a block, in copies of its values: the block itself and the temporaries of the
+# differencing
+_WORKING_COPIES = 4
+
+
+def _normalize(values, **_):
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    values -= mean
+    values /= std
+
+
+def _cumulative(values, **_):
+    # (values + 1).cumprod() - 1, NaN being skipped like pandas does
+    values += 1
+    nan = np.isnan(values)
+    values[nan] = 1
+    np.cumprod(values, axis=0, out=values)
+    values -= 1
+    values[nan] = np.nan
+
+
+def _stationnarize(values, **kwargs):
+    values[:] = qt.FractionalDiff()(values, rename=False, **kwargs)
+
+
+# the steps run in place on a block of columns, the rows being time
+_STEPS = {
+    "stationnarize": _stationnarize,
+    "normalize": _normalize,
+    "cumulative": _cumulative,
+}
+
+
+class LazyTable:
+    """
+    A plan of transforms over a Table or a file, run by collect() or indicators(). Nothing is computed
+    when a step is recorded. At collection, the date slices that come before any transform are pushed
+    down to the source (a parquet, feather or npy file only reads those rows), then every step runs in
+    place on one block of columns at a time, so the pipeline makes a single copy of the data instead
+    of one per step. An npy source is read block by block from its memory map, so that panels larger
+    than memory can be processed within a memory budget.
+
+    Like their eager counterparts, the steps only keep the numeric columns.
+
+    :param source: a Table, or the path of a file
+    :type source: Union[Table, str]
+    :param columns: the columns to read, defaults to None (all)
+    :type columns: Optional[List]
+    """
+
+    def __init__(
+        self,
+        source: Union["qt.Table", str],
+        columns: Optional[List] = None,
+        _plan: Optional[list] = None,
+    ) -> None:
+        self.source = source
+        self.columns = columns
+        self._plan = _plan or []
+
+    def _with(self, *step) -> "LazyTable":
+        return LazyTable(self.source, self.columns, [*self._plan, step])
+
+    def slice(self, start=None, end=None) -> "LazyTable":
+        """
+        It keeps the rows between start and end, both included
+        """
+        return self._with("slice", {"start": start, "end": end})
+
+    def stationnarize(
+        self,
+        precision: float = 0.1,
+        method: str = "fixed-window",
+        order: Optional[Union[float, int]] = None,
+        window_size: int = 10,
+        threshold: float = 1e-5,
+        search: str = "bisection",
+        cache=None,
+    ) -> "LazyTable":
+        """
+        It records a Table.stationnarize step
+        """
+        return self._with(
+            "stationnarize",
+            {
+                "precision": precision,
+                "method": method,
+                "order": order,
+                "window_size": window_size,
+                "threshold": threshold,
+                "search": search,
+                "cache": cache,
+            },
+        )
+
+    def normalize(self) -> "LazyTable":
+        """
+        It records a Table.normalize step
+        """
+        return self._with("normalize", {})
+
+    def cumulative(self, start=None, end=None) -> "LazyTable":
+        """
+        It records a Table.cumulative step
+        """
+        plan = self.slice(start, end) if start is not None or end is not None else self
+        return plan._with("cumulative", {})
+
+    def _optimize(self):
+        # the slices before the first transform are merged and pushed down to the source
+        start, end, i = None, None, 0
+        while i < len(self._plan) and self._plan[i][0] == "slice":
+            params = self._plan[i][1]
+            if params["start"] is not None:
+                start = (
+                    params["start"]
+                    if start is None
+                    else max(pd.Timestamp(start), pd.Timestamp(params["start"]))
+                )
+            if params["end"] is not None:
+                end = (
+                    params["end"]
+                    if end is None
+                    else min(pd.Timestamp(end), pd.Timestamp(params["end"]))
+                )
+            i += 1
+        return start, end, self._plan[i:]
+
+    def explain(self) -> str:
+        """
+        It describes the optimized plan
+
+        :return: one line per stage
+        """
+        start, end, plan = self._optimize()
+        source = (
+            f"scan {self.source}"
+            if isinstance(self.source, str)
+            else f"Table {self.source.shape[0]} x {self.source.shape[1]}"
+        )
+        lines = [f"{source}, rows {start} to {end}, columns {self.columns or 'all'}"]
+        steps = [
+            f"slice({params['start']}, {params['end']})"
+            if name == "slice"
+            else name
+            + "("
+            + ", ".join(f"{key}={value}" for key, value in params.items())
+            + ")"
+            for name, params in plan
+        ]
+        if steps:
+            lines.append("in place, per block of columns: " + " -> ".join(steps))
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"LazyTable\n{self.explain()}"
+
+    def _open(self, start, end):
+        # the numeric columns and the index of the source rows, and a reader of blocks of them
+        if isinstance(self.source, str) and self.source.rstrip("/").endswith(".npy"):
+            index, dtypes, column = open_npy(self.source, start, end)
+            columns = [
+                col
+                for col in (dtypes if self.columns is None else self.columns)
+                if np.issubdtype(dtypes[col], np.number)
+            ]
+
+            def read(first, last, rows=slice(None)):
+                block = np.empty((len(index[rows]), len(columns[first:last])), order="F")
+                for j, col in enumerate(columns[first:last]):
+                    block[:, j] = column(col)[rows]
+                return block
+
+            return pd.Index(columns), index, read
+
+        if isinstance(self.source, str):
+            binary = self.source.rstrip("/").split(".")[-1] in __binary_filetype__
+            data = (
+                qt.Table(self.source, columns=self.columns, start=start, end=end)
+                if binary
+                else qt.Table(self.source)
+            )
+        else:
+            data = self.source
+        data = data if self.columns is None else data[self.columns]
+        data = data.loc[start:end].select_dtypes(include="number")
+
+        def read(first, last, rows=slice(None)):
+            return np.array(data.iloc[rows, first:last].to_numpy(dtype=float), order="F")
+
+        return data.columns, data.index, read
+
+    def _prepare(self):
+        start, end, plan = self._optimize()
+        columns, index, read = self._open(start, end)
+
+        # the remaining slices, as row ranges
+        rows, out_index = [], index
+        for name, params in plan:
+            if name == "slice":
+                rows.append(out_index.slice_indexer(params["start"], params["end"]))
+                out_index = out_index[rows[-1]]
+        return plan, columns, index, read, rows, out_index
+
+    @staticmethod
+    def _width(memory_budget, n_rows, block_size):
+        # the number of columns of a block fitting in the memory budget
+        if memory_budget is None:
+            return block_size
+        return memory_budget // (_WORKING_COPIES * 8 * max(n_rows, 1))
+
+    @staticmethod
+    def _column_blocks(plan, n_columns, read, rows, width):
+        for first in range(0, n_columns, width):
+            block = read(first, first + width)
+            slices = iter(rows)
+            for name, params in plan:
+                if name == "slice":
+                    block = block[next(slices)]
+                else:
+                    _STEPS[name](block, **params)
+            yield first, block
+
+    @staticmethod
+    def _overlap(plan):
+        # the rows of history a time block needs, when the plan only differences with fixed orders
+        overlap = 0
+        for name, params in plan:
+            if name != "stationnarize" or params["order"] is None:
+                return None
+            weights = (
+                ffd_weights(params["order"], params["threshold"])
+                if params["method"] == "ffd"
+                else frac_diff_weights(params["order"], params["window_size"])
+            )
+            overlap += len(weights) - 1
+        return overlap
+
+    def collect(
+        self,
+        block_size: int = 64,
+        memory_budget: Optional[int] = None,
+        sink: Optional[str] = None,
+    ) -> "qt.Table":
+        """
+        It runs the plan. With a memory budget, the blocks are sized so that the working memory stays
+        within it: blocks of columns, or blocks of rows overlapping by the window of the differencing
+        when a single column does not fit and the plan only differences with fixed orders. With an
+        npy source and an npy sink, the panel never needs to fit in memory.
+
+        :param block_size: the number of columns processed together, defaults to 64
+        :type block_size: int
+        :param memory_budget: the working memory in bytes, overrides block_size, defaults to None
+        :type memory_budget: Optional[int]
+        :param sink: the path of an npy table to write the result to, defaults to None (in memory)
+        :type sink: Optional[str]
+        :return: the eager Table, memory-mapped from the sink if any
+        """
+        plan, columns, index, read, rows, out_index = self._prepare()
+        n_columns = len(columns)
+
+        out = (
+            create_npy(sink, out_index, columns.tolist())
+            if sink is not None
+            else np.empty((len(out_index), n_columns), order="F")
+        )
+
+        width = self._width(memory_budget, len(index), block_size)
+        overlap = self._overlap(plan)
+        if width >= 1 or not n_columns:
+            for first, block in self._column_blocks(plan, n_columns, read, rows, width):
+                out[:, first : first + width] = block
+        elif overlap is not None:
+            height = memory_budget // (_WORKING_COPIES * 8 * n_columns) - overlap  # type: ignore
+            if height < 1:
+                raise MemoryError(
+                    f"A block of {overlap + 1} rows does not fit in {memory_budget} bytes"
+                )
+            for first in range(0, len(index), height):
+                lookback = min(first, overlap)
+                block = read(0, n_columns, slice(first - lookback, first + height))
+                for _, params in plan:
+                    _STEPS["stationnarize"](block, **params)
+                out[first : first + height] = block[lookback:]
+        else:
+            raise MemoryError(
+                f"A column of {len(index)} rows does not fit in {memory_budget} bytes, and only a "
+                "plan of fixed order stationnarize steps can run by blocks of rows"
+            )
+
+        if sink is not None:
+            out.flush()  # type: ignore
+            del out
+            return qt.Table(sink)
+        return qt.Table(out, index=out_index, columns=columns)
+
+    def indicators(
+        self,
+        risk_free: float = 0,
+        block_size: int = 64,
+        memory_budget: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        It runs the plan and computes the indicators of every column, one block of columns at a time
+
+        :param risk_free: the risk free rate, defaults to 0
+        :type risk_free: float
+        :param block_size: the number of columns processed together, defaults to 64
+        :type block_size: int
+        :param memory_budget: the working memory in bytes, overrides block_size, defaults to None
+        :type memory_budget: Optional[int]
+        :return: the indicators, one column per column of the result
+        """
+        plan, columns, index, read, rows, out_index = self._prepare()
+        width = self._width(memory_budget, len(index), block_size)
+        if width < 1:
+            raise MemoryError(
+                f"A column of {len(index)} rows does not fit in {memory_budget} bytes"
+            )
+
+        results = [
+            qt.Table(
+                block, index=out_index, columns=columns[first : first + width]
+            ).indicators(risk_free=risk_free)
+            for first, block in self._column_blocks(plan, len(columns), read, rows, width)
+        ]
+        return pd.concat(results, axis=1) if results else pd.DataFrame()
+
+
+def lazy(self, columns: Optional[List] = None) -> LazyTable:
+    """
+    It starts a lazy plan over the table, see LazyTable
+
+    :param columns: the columns to keep, defaults to None (all)
+    :type columns: Optional[List]
+    :return: A LazyTable
+    """
+    return LazyTable(self, columns)
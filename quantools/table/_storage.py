@@ -0,0 +1,252 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# parquet and feather go through pandas and need the optional pyarrow dependency,
+# npy is a directory of memory-mapped numpy arrays that only needs numpy
+__binary_filetype__ = ["parquet", "feather", "npy"]
+
+
+def _filetype(path):
+    filetype = path.rstrip("/").split(".")[-1]
+    if filetype not in __binary_filetype__:
+        raise ValueError(
+            f"Filetype {filetype} is not supported, use one of {__binary_filetype__}"
+        )
+    return filetype
+
+
+def _require_pyarrow(filetype):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as error:
+        raise ImportError(
+            f"{filetype} files need the optional pyarrow dependency: pip install pyarrow"
+        ) from error
+
+
+def save_table(self, path):
+    """
+    It saves the table in a columnar binary format that keeps the datetime index and the dtypes.
+    The format is given by the extension of path: "parquet", "feather" or "npy". A "npy" path is a
+    directory holding one Fortran-ordered array per dtype, so that a column is a contiguous range
+    of bytes that can be memory-mapped.
+
+    :param path: the path of the file, or of the directory for "npy"
+    :type path: str
+    """
+    filetype = _filetype(path)
+    # a plain DataFrame sharing the data of the table, with its own axes
+    frame = pd.DataFrame(self.copy(deep=False))
+    if filetype != "npy":
+        frame.index = frame.index.rename("date")
+
+    if filetype != "npy":
+        _require_pyarrow(filetype)
+    if filetype == "parquet":
+        frame.to_parquet(path)
+    elif filetype == "feather":
+        frame.reset_index().to_feather(path)
+    else:
+        _save_npy(frame, path)
+
+
+def _save_npy(frame, path):
+    if frame.columns.nlevels > 1:
+        raise ValueError("npy storage does not support MultiIndex columns")
+    index = np.asarray(frame.index)
+    if index.dtype == object or any(dtype == object for dtype in frame.dtypes):
+        raise ValueError(
+            "npy storage only holds numeric and datetime data, use parquet instead"
+        )
+
+    os.makedirs(path, exist_ok=True)
+    groups = {}
+    for position, dtype in enumerate(frame.dtypes):
+        groups.setdefault(str(dtype), []).append(position)
+
+    for i, positions in enumerate(groups.values()):
+        block = np.asfortranarray(frame.iloc[:, positions].to_numpy())
+        np.save(os.path.join(path, f"block_{i}.npy"), block)
+    _write_index(path, frame.index, frame.columns.tolist(), list(groups.values()))
+
+
+def _write_index(path, index, columns, groups):
+    np.save(os.path.join(path, "index.npy"), np.asarray(index))
+    meta = {
+        "columns": columns,
+        "groups": groups,
+        "index_name": index.name,
+        "sorted": bool(index.is_monotonic_increasing),
+    }
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+
+def create_npy(path, index, columns, dtype=np.float64):
+    """
+    It creates an npy table of a single dtype and returns its values, memory-mapped for writing, so
+    that a table larger than memory can be written block by block
+
+    :param path: the path of the directory
+    :type path: str
+    :param index: the index of the table
+    :type index: pd.Index
+    :param columns: the columns of the table
+    :type columns: list
+    :return: The (rows, columns) Fortran-ordered memory map of the values
+    """
+    os.makedirs(path, exist_ok=True)
+    _write_index(path, index, list(columns), [list(range(len(columns)))])
+    return np.lib.format.open_memmap(
+        os.path.join(path, "block_0.npy"),
+        mode="w+",
+        dtype=dtype,
+        shape=(len(index), len(columns)),
+        fortran_order=True,
+    )
+
+
+def open_npy(path, start=None, end=None):
+    """
+    It memory-maps the columns of an npy table: nothing is read until they are indexed
+
+    :param path: the path of the directory
+    :type path: str
+    :param start: the first date, defaults to None
+    :param end: the last date, defaults to None
+    :return: The index of the date range, the dtypes of the columns, and a function returning the
+    rows of the date range of a column (a memory map when the index is sorted)
+    """
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+
+    index = np.load(os.path.join(path, "index.npy"), mmap_mode="r")
+    rows = _row_selection(index, start, end, meta["sorted"])
+    index = pd.Index(np.array(index[rows]), name=meta["index_name"])
+
+    arrays = {}
+    for i, positions in enumerate(meta["groups"]):
+        block = np.load(os.path.join(path, f"block_{i}.npy"), mmap_mode="r")
+        for j, position in enumerate(positions):
+            arrays[meta["columns"][position]] = block[:, j]
+
+    def column(col):
+        return arrays[col][rows]
+
+    return index, {col: array.dtype for col, array in arrays.items()}, column
+
+
+def _row_selection(index, start, end, is_sorted):
+    # the rows of the date range: a slice (a view of the memory map) when the index is sorted
+    if start is None and end is None:
+        return slice(None)
+    to_key = (
+        (lambda date: pd.Timestamp(date).to_datetime64())
+        if np.issubdtype(index.dtype, np.datetime64)
+        else (lambda value: value)
+    )
+    if is_sorted:
+        first = 0 if start is None else np.searchsorted(index, to_key(start), "left")
+        last = len(index) if end is None else np.searchsorted(index, to_key(end), "right")
+        return slice(first, last)
+    mask = np.ones(len(index), dtype=bool)
+    if start is not None:
+        mask &= index >= to_key(start)
+    if end is not None:
+        mask &= index <= to_key(end)
+    return mask
+
+
+def _column_selection(positions):
+    # a slice when the columns are contiguous, so that the block stays a view
+    if len(positions) and np.all(np.diff(positions) == 1):
+        return slice(positions[0], positions[-1] + 1)
+    return positions
+
+
+def _load_npy(path, columns=None, start=None, end=None):
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+
+    all_columns = meta["columns"]
+    if columns is None:
+        columns = all_columns
+    missing = [col for col in columns if col not in all_columns]
+    if missing:
+        raise KeyError(f"Columns {missing} are not in {path}")
+    wanted = {all_columns.index(col) for col in columns}
+
+    index = np.load(os.path.join(path, "index.npy"), mmap_mode="r")
+    rows = _row_selection(index, start, end, meta["sorted"])
+    index = pd.Index(np.array(index[rows]), name=meta["index_name"])
+
+    frames = []
+    for i, positions in enumerate(meta["groups"]):
+        selected = [j for j, position in enumerate(positions) if position in wanted]
+        if not selected:
+            continue
+        # copy-on-write mapping: only the selected pages are read and the table stays writable
+        block = np.load(os.path.join(path, f"block_{i}.npy"), mmap_mode="c")
+        block = block[rows][:, _column_selection(selected)]
+        frames.append(
+            pd.DataFrame(
+                block,
+                index=index,
+                columns=[all_columns[positions[j]] for j in selected],
+                copy=False,
+            )
+        )
+
+    if not frames:
+        return pd.DataFrame(index=index)
+    data = frames[0] if len(frames) == 1 else pd.concat(frames, axis=1, copy=False)
+    return data if list(data.columns) == list(columns) else data[list(columns)]
+
+
+def load_table(path, columns=None, start=None, end=None):
+    """
+    It reads a table saved by Table.save, reading only the requested columns and date range
+
+    :param path: the path of the file, or of the directory for "npy"
+    :type path: str
+    :param columns: the columns to read, defaults to None (all)
+    :type columns: list, optional
+    :param start: the first date to read, defaults to None
+    :param end: the last date to read, defaults to None
+    :return: A DataFrame indexed by date
+    """
+    filetype = _filetype(path)
+
+    if filetype == "npy":
+        return _load_npy(path, columns, start, end)
+
+    _require_pyarrow(filetype)
+    if filetype == "parquet":
+        filters = []
+        if start is not None:
+            filters.append(("date", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("date", "<=", pd.Timestamp(end)))
+        data = pd.read_parquet(path, columns=columns, filters=filters or None)
+    else:
+        import pyarrow.dataset as ds
+
+        condition = None
+        if start is not None:
+            condition = ds.field("date") >= pd.Timestamp(start)
+        if end is not None:
+            before_end = ds.field("date") <= pd.Timestamp(end)
+            condition = before_end if condition is None else condition & before_end
+        data = (
+            ds.dataset(path, format="feather")
+            .to_table(
+                columns=None if columns is None else ["date", *columns], filter=condition
+            )
+            .to_pandas()
+            .set_index("date")
+        )
+
+    return data
@@ -1,15 +1,31 @@
 import pandas as pd
 from pandas import DataFrame, Series
+from pandas.core.internals import BlockManager
 import os
 import logging
 import numpy as np
 from typing import Optional, Union
 import re
+import weakref
+from collections import OrderedDict
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
 
 import quantools as qt
 
-from bokeh.plotting import show
-from bokeh.models import TabPanel, Tabs
+from ..utils import profiling
+from ..utils.autocorrelation import acf, pacf
+from ._lazy import lazy
+from ._storage import __binary_filetype__, load_table, save_table
+from ._indicators import (
+    bootstrap_indices,
+    indicators_kernel,
+    range_indicators_kernel,
+    rolling_indicators_kernel,
+)
 
 
 # !!!! uses ddof=0 in std calculation
@@ -17,16 +33,153 @@ from bokeh.models import TabPanel, Tabs
 
 logger = logging.getLogger(__name__)
 
-__authorized_filetype__ = ["csv", "json", "excel", "txt"]
+__authorized_filetype__ = ["csv", "json", "excel", "txt", *__binary_filetype__]
 
 __available_indicators__ = ["sharpe", "sortino", "calmar", "max_drawdown"]
 
 
+def _find_datetime_column(data):
+    """
+    It looks for the first column whose first value looks like a date
+
+    :param data: the DataFrame to search
+    :return: the column and the kind of dates it holds ("str", "epoch" or "datetime"), or (None, None)
+    """
+    if len(data) == 0:
+        return None, None
+    for col in data.columns:
+        first_value = data[col].iloc[0]
+        if isinstance(first_value, str):
+            if re.match(r"\d{4}-\d{2}-\d{2}", first_value) or re.match(
+                r"\d{2}/\d{2}/\d{4}", first_value
+            ):
+                return col, "str"
+        elif isinstance(first_value, int):
+            if first_value > 1e9:
+                return col, "epoch"
+        elif pd.api.types.is_datetime64_any_dtype(first_value):
+            return col, "datetime"
+    return None, None
+
+
+def _parse_dates(values, kind, date_format=None):
+    if kind == "epoch":
+        return pd.to_datetime(values, unit="s")
+    if kind == "str":
+        return pd.to_datetime(values, format=date_format)
+    return values
+
+
+def _count_lines(path, block_size=1 << 20):
+    n_lines, last = 0, b"\n"
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            n_lines += block.count(b"\n")
+            last = block[-1:]
+    return n_lines + (last != b"\n")
+
+
+def _read_csv_chunked(path, header=None, chunksize=100_000, date_format=None, downcast=False):
+    """
+    It streams a csv file by chunks into preallocated arrays, one per dtype, so that the peak memory is
+    the final DataFrame plus one chunk. The datetime column is detected once on a sample and parsed with
+    an explicit format. The columns and dtypes are those of the plain loader: an integer column holding
+    missing values further down is read as float64.
+
+    :param path: the path of the file
+    :param header: the header row, defaults to None
+    :param chunksize: the number of rows of each chunk, defaults to 100_000
+    :param date_format: the strftime format of the datetime column, defaults to None (guessed)
+    :param downcast: store the numeric columns as float32, defaults to False
+    :return: A DataFrame indexed by the datetime column if any
+    """
+    sample = pd.read_csv(path, header=header, nrows=min(chunksize, 1000))
+    date_col, kind = _find_datetime_column(sample)
+    if kind == "str" and date_format is None:
+        date_format = guess_datetime_format(sample[date_col].iloc[0])
+
+    columns = [col for col in sample.columns if col != date_col]
+    dtypes = {
+        col: np.dtype(np.float32) if downcast else sample[col].dtype
+        for col in columns
+        if pd.api.types.is_numeric_dtype(sample[col])
+    }
+    other_cols = [col for col in columns if col not in dtypes]
+
+    n_rows = max(_count_lines(path) - (0 if header is None else header + 1), 0)
+    # the columns of a dtype are the contiguous columns of one array
+    groups = {dtype: [col for col in dtypes if dtypes[col] == dtype] for dtype in dtypes.values()}
+    arrays = {
+        dtype: np.empty((n_rows, len(cols)), dtype=dtype, order="F") for dtype, cols in groups.items()
+    }
+    values = {
+        col: arrays[dtype][:, cols.index(col)] for dtype, cols in groups.items() for col in cols
+    }
+    promoted = {}  # integer columns holding missing values, moved to their own float64 array
+    dates = np.empty(n_rows, dtype="datetime64[ns]")
+    others = {col: [] for col in other_cols}
+
+    position = 0
+    reader = pd.read_csv(
+        path,
+        header=header,
+        chunksize=chunksize,
+        # the object columns of the sample stay strings in every chunk, as in the plain loader
+        dtype={
+            **{col: dtype for col, dtype in dtypes.items() if dtype.kind == "f"},
+            **{col: object for col in other_cols},
+        },
+    )
+    for chunk in reader:
+        rows = slice(position, position + len(chunk))
+        for col, column in values.items():
+            chunk_values = chunk[col].to_numpy()
+            if column.dtype.kind in "iub" and chunk_values.dtype.kind not in "iub":
+                promoted[col] = np.empty(n_rows)
+                promoted[col][:position] = column[:position]
+                column = values[col] = promoted[col]
+            column[rows] = chunk_values
+        if date_col is not None:
+            dates[rows] = _parse_dates(chunk[date_col], kind, date_format).to_numpy()
+        for col in other_cols:
+            others[col].append(chunk[col].to_numpy())
+        position += len(chunk)
+
+    # blank lines are counted but not read: the views drop the unused rows without a copy
+    index = (
+        pd.DatetimeIndex(dates[:position], name="date")
+        if date_col is not None
+        else pd.RangeIndex(position)
+    )
+    frames = [
+        pd.DataFrame(arrays[dtype][:position], index=index, columns=cols, copy=False)
+        for dtype, cols in groups.items()
+    ]
+    if not frames:  # no numeric column, e.g. a header row read as data
+        data = pd.DataFrame(index=index)
+    elif len(frames) == 1:
+        data = frames[0]
+    else:
+        data = pd.concat(frames, axis=1, copy=False)
+    for col in promoted:
+        data[col] = promoted[col][:position]
+    for col in other_cols:
+        data[col] = np.concatenate(others[col]) if others[col] else np.array([], dtype=object)
+    if list(data.columns) != columns:
+        data = data[columns]  # a copy, when the numeric columns are not the first ones
+    return data
+
+
+def _operation(func, args) -> str:
+    # the name of a metric in the profiles, e.g. "Table.sharpe"
+    return f"{type(args[0]).__name__}.{func.__name__}" if args else func.__name__
+
+
 def return_Table(func):
     def wrapper(*args, **kwargs):
         result = func(*args, **kwargs)
         return (
-            Table(result, verbose=False)
+            Table.from_frame(result)
             if isinstance(result, (DataFrame, Series))
             else result
         )
@@ -40,17 +193,130 @@ def assert_ts(func):
             raise ValueError("Method can only be applied to Table object")
         if not pd.api.types.is_datetime64_any_dtype(args[0].index):
             raise ValueError("Method can only be applied to Table with datetime index")
-        return func(*args, **kwargs)
+        if profiling._active is None:
+            return func(*args, **kwargs)
+        return profiling._active.call(_operation(func, args), func, args, kwargs)
 
     return wrapper
 
 
-def daily_resampler(self):
+def _resample_daily(self):
     _a = self.resample("1D").last()
     _a = _a.fillna(method="ffill")  # if oversampling
     return _a
 
 
+@profiling.instrument
+def daily_resampler(self):
+    if isinstance(self, _ResampleCache):
+        return self._cached(("daily",), lambda: _resample_daily(self))
+    return _resample_daily(self)
+
+
+class _ResampleCache:
+    """
+    Per object cache of the daily resampled data (and of its cumulative series), shared by the metrics.
+    It is dropped on the mutations pandas reports to the object: setitem, loc/iloc/at writes, inplace
+    methods and operators, a new index, and the chained writes of its columns
+    (t[c].fillna(inplace=True), t[c].iloc[:n] = x). The views of another object, a column (t[c]) or a
+    slice (t.iloc[n:], s.loc[a:b]), are not cached, as the writes on their parent are not reported to
+    them, and their own writes drop the cache of their parents. Other writes are not seen, e.g.
+    directly on the underlying arrays (through .values) or on a frame the Table was built from without
+    a copy: call cache_clear() after them.
+    """
+
+    _cache_maxsize = 32
+
+    def _resample_cache(self):
+        cache = self.__dict__.get("_resample_cache_")
+        if cache is None:
+            cache = {"entries": OrderedDict(), "hits": 0, "misses": 0, "token": None}
+            object.__setattr__(self, "_resample_cache_", cache)
+        token = (id(self.index), self.shape)  # type: ignore
+        if cache["token"] != token:
+            cache["entries"].clear()
+            cache["token"] = token
+        return cache
+
+    def _cached(self, key, compute):
+        cache = self._resample_cache()
+        if self.__dict__.get("_cacher") is not None or self._view_parent() is not None:
+            # a column or a slice shares its data: the writes on the parent are not seen here
+            cache["misses"] += 1
+            return compute()
+        try:
+            value = cache["entries"][key]
+        except KeyError:
+            cache["misses"] += 1
+            value = cache["entries"][key] = compute()
+            if len(cache["entries"]) > self._cache_maxsize:
+                cache["entries"].popitem(last=False)
+            return value
+        except TypeError:  # unhashable start / end
+            cache["misses"] += 1
+            return compute()
+        cache["hits"] += 1
+        cache["entries"].move_to_end(key)
+        return value
+
+    def _view_parent(self):
+        # the object this one was sliced from: pandas tracks it for the frames, TableSeries for itself
+        ref = self.__dict__.get("_is_copy") or self.__dict__.get("_resample_parent_")
+        return ref() if ref is not None else None
+
+    def _invalidate_cache(self):
+        obj = self
+        while obj is not None:  # a write on a view is a write on its parents
+            cache = obj.__dict__.get("_resample_cache_")
+            if cache is not None:
+                cache["entries"].clear()
+            obj = obj._view_parent() if isinstance(obj, _ResampleCache) else None
+
+    def cache_info(self):
+        """
+        :return: the hits, misses and current size of the daily resample cache
+        """
+        cache = self._resample_cache()
+        return {
+            "hits": cache["hits"],
+            "misses": cache["misses"],
+            "size": len(cache["entries"]),
+        }
+
+    def cache_clear(self):
+        """
+        Clears the daily resample cache and its statistics
+        """
+        object.__setattr__(self, "_resample_cache_", None)
+
+    # pandas mutation hooks
+    def _clear_item_cache(self):
+        self._invalidate_cache()
+        return super()._clear_item_cache()  # type: ignore
+
+    def _update_inplace(self, *args, **kwargs):
+        self._invalidate_cache()
+        return super()._update_inplace(*args, **kwargs)  # type: ignore
+
+    def _inplace_method(self, *args, **kwargs):
+        result = super()._inplace_method(*args, **kwargs)  # type: ignore
+        self._invalidate_cache()
+        return result
+
+    def __setitem__(self, key, value):
+        self._invalidate_cache()
+        return super().__setitem__(key, value)  # type: ignore
+
+    def _maybe_cache_changed(self, *args, **kwargs):
+        # a column was written through a chained write, e.g. t[c].fillna(inplace=True)
+        self._invalidate_cache()
+        return super()._maybe_cache_changed(*args, **kwargs)  # type: ignore
+
+    def _maybe_update_cacher(self, *args, **kwargs):
+        self._invalidate_cache()
+        return super()._maybe_update_cacher(*args, **kwargs)  # type: ignore
+
+
 @assert_ts
 def sharpe(self, start=None, end=None, risk_free=0):
     _daily = daily_resampler(self)
@@ -70,7 +336,11 @@ def sortino(self, start=None, end=None, risk_free=0):
 @assert_ts
 def drawdowns(self, start=None, end=None):
     _daily = daily_resampler(self)
-    _price = (_daily.loc[start:end] + 1).cumprod() - 1
+    _cumulative = lambda: (_daily.loc[start:end] + 1).cumprod() - 1  # noqa: E731
+    if isinstance(self, _ResampleCache):
+        _price = self._cached(("cumulative", start, end), _cumulative)
+    else:
+        _price = _cumulative()
     _cummax = _price.cummax()
     return _cummax - _price
 
@@ -91,12 +361,188 @@ def calmar(self, start=None, end=None, risk_free=0):
 
 @assert_ts
 def indicators(self, start=None, end=None, risk_free=0):
-    indicators_names, indicators_values = [], []
-    for indicator in __available_indicators__:
-        indicators_names.append(indicator)
-        indicators_values.append(getattr(self, indicator)(start, end, risk_free))
+    # resamples once, then computes every indicator of every column in one pass
+    _daily = daily_resampler(self).loc[start:end]
+    if not isinstance(self, Series):
+        _daily = _daily.select_dtypes(include="number")
+    values = _daily.to_numpy(dtype=float).reshape(len(_daily), -1)
+    results = indicators_kernel(values, risk_free)
+
+    indicators_values = np.array([results[name] for name in __available_indicators__])
+    if isinstance(self, Series):
+        return pd.DataFrame(
+            indicators_values, index=__available_indicators__, columns=["value"]
+        )
+    return pd.DataFrame(
+        indicators_values, index=__available_indicators__, columns=_daily.columns
+    )
+
 
-    return pd.DataFrame(indicators_values, index=indicators_names, columns=["value"])
+def _windows_table(self, num, _daily, ends, results):
+    # one column per indicator for a TableSeries, (indicator, column) columns for a Table
+    values = np.concatenate([results[name] for name in __available_indicators__], axis=1)
+    columns = (
+        pd.Index(__available_indicators__)
+        if isinstance(self, Series)
+        else pd.MultiIndex.from_product([__available_indicators__, num.columns])
+    )
+    return Table(values, index=_daily.index[ends], columns=columns)
+
+
+@assert_ts
+def rolling_indicators(self, window, step=1, risk_free=0):
+    """
+    Sharpe, sortino, calmar and max drawdown over rolling windows of daily returns, in O(n) per column
+
+    :param window: the number of days of each window
+    :type window: int
+    :param step: the number of days between two window ends, defaults to 1
+    :type step: int (optional)
+    :param risk_free: the risk free rate, defaults to 0
+    :type risk_free: float (optional)
+    :return: A Table indexed by the window ends
+    """
+    _daily = daily_resampler(self)
+    num = _daily if isinstance(self, Series) else _daily.select_dtypes(include="number")
+    values = num.to_numpy(dtype=float).reshape(len(num), -1)
+    ends, results = rolling_indicators_kernel(values, window, step, risk_free)
+    return _windows_table(self, num, _daily, ends, results)
+
+
+@assert_ts
+def expanding_indicators(self, min_periods=1, step=1, risk_free=0):
+    """
+    Sharpe, sortino, calmar and max drawdown of daily returns since the first day, in O(n) per column
+
+    :param min_periods: the number of days of the first window, defaults to 1
+    :type min_periods: int (optional)
+    :param step: the number of days between two window ends, defaults to 1
+    :type step: int (optional)
+    :param risk_free: the risk free rate, defaults to 0
+    :type risk_free: float (optional)
+    :return: A Table indexed by the window ends
+    """
+    _daily = daily_resampler(self)
+    num = _daily if isinstance(self, Series) else _daily.select_dtypes(include="number")
+    values = num.to_numpy(dtype=float).reshape(len(num), -1)
+    ends, results = rolling_indicators_kernel(
+        values, min_periods, step, risk_free, expanding=True
+    )
+    return _windows_table(self, num, _daily, ends, results)
+
+
+@assert_ts
+def range_indicators(self, ranges, risk_free=0):
+    """
+    Sharpe, sortino, calmar and max drawdown over many (start, end) date ranges. The daily returns are
+    resampled once, then each range is answered from prefix sums (and a segment tree for the drawdown)
+
+    :param ranges: the (start, end) date ranges, with the same meaning as in indicators(start, end)
+    :type ranges: list
+    :param risk_free: the risk free rate, defaults to 0
+    :type risk_free: float (optional)
+    :return: A DataFrame indexed by the ranges
+    """
+    _daily = daily_resampler(self)
+    num = _daily if isinstance(self, Series) else _daily.select_dtypes(include="number")
+    values = num.to_numpy(dtype=float).reshape(len(num), -1)
+
+    positions = [_daily.index.slice_indexer(start, end) for start, end in ranges]
+    non_empty = np.array([pos.start < pos.stop for pos in positions], dtype=bool)
+    starts = np.array([pos.start for pos in positions], dtype=int)[non_empty]
+    ends = np.array([pos.stop - 1 for pos in positions], dtype=int)[non_empty]
+    results = range_indicators_kernel(values, starts, ends, risk_free)
+
+    columns = (
+        pd.Index(__available_indicators__)
+        if isinstance(self, Series)
+        else pd.MultiIndex.from_product([__available_indicators__, num.columns])
+    )
+    indicators_values = np.full((len(ranges), len(columns)), np.nan)
+    indicators_values[non_empty] = np.concatenate(
+        [results[name] for name in __available_indicators__], axis=1
+    )
+    return pd.DataFrame(
+        indicators_values,
+        index=pd.MultiIndex.from_tuples(list(ranges), names=["start", "end"]),
+        columns=columns,
+    )
+
+
+@assert_ts
+def bootstrap_indicators(
+    self,
+    n=1000,
+    block_size=20,
+    method="stationary",
+    risk_free=0,
+    confidence=0.95,
+    chunk_size=1000,
+    seed=None,
+    return_samples=False,
+):
+    """
+    Block bootstrap confidence intervals of sharpe, sortino, calmar and max drawdown. The resamples of
+    the daily returns are generated as one array of row indices per chunk, every column being resampled
+    with the same rows, and their indicators are computed in one vectorized pass. Only chunk_size
+    resamples are in memory at once
+
+    :param n: the number of resamples, defaults to 1000
+    :type n: int
+    :param block_size: the (mean) length of the blocks, in days, defaults to 20
+    :type block_size: int
+    :param method: "stationary" or "circular" block bootstrap, defaults to "stationary"
+    :type method: str
+    :param risk_free: the risk free rate, defaults to 0
+    :type risk_free: float (optional)
+    :param confidence: the level of the percentile confidence interval, defaults to 0.95
+    :type confidence: float
+    :param chunk_size: the number of resamples processed together, defaults to 1000
+    :type chunk_size: int
+    :param seed: the seed of the random generator, defaults to None
+    :param return_samples: also return the indicators of every resample, defaults to False
+    :type return_samples: bool
+    :return: A DataFrame with the estimate, the bootstrap mean and std and the confidence interval of
+    every indicator (and column, for a Table). With return_samples, also the (n, indicators) samples
+    """
+    _daily = daily_resampler(self)
+    num = _daily if isinstance(self, Series) else _daily.select_dtypes(include="number")
+    values = num.to_numpy(dtype=float).reshape(len(num), -1)
+    n_rows, n_cols = values.shape
+    rng = np.random.default_rng(seed)
+
+    samples = {name: np.empty((n, n_cols)) for name in __available_indicators__}
+    for first in range(0, n, chunk_size):
+        size = min(chunk_size, n - first)
+        rows = bootstrap_indices(n_rows, size, block_size, method, rng)
+        # (n_rows, size, n_cols) resampled returns, one series per (resample, column)
+        results = indicators_kernel(values[rows].reshape(n_rows, -1), risk_free)
+        for name in __available_indicators__:
+            samples[name][first : first + size] = results[name].reshape(size, n_cols)
+
+    estimate = indicators_kernel(values, risk_free)
+    columns = (
+        pd.Index(__available_indicators__)
+        if isinstance(self, Series)
+        else pd.MultiIndex.from_product([__available_indicators__, num.columns])
+    )
+    sample_values = np.concatenate([samples[name] for name in __available_indicators__], axis=1)
+    alpha = (1 - confidence) / 2
+    with np.errstate(invalid="ignore"):
+        low, high = np.nanquantile(sample_values, [alpha, 1 - alpha], axis=0)
+        summary = pd.DataFrame(
+            {
+                "estimate": np.concatenate([estimate[name] for name in __available_indicators__]),
+                "mean": np.nanmean(sample_values, axis=0),
+                "std": np.nanstd(sample_values, axis=0, ddof=1),
+                "low": low,
+                "high": high,
+            },
+            index=columns,
+        )
+    if return_samples:
+        return summary, pd.DataFrame(sample_values, columns=columns)
+    return summary
 
 
 @assert_ts
@@ -104,7 +550,7 @@ def cumulative(self, start=None, end=None):
     return (self.loc[start:end] + 1).cumprod() - 1
 
 
-class TableSeries(Series):
+class TableSeries(_ResampleCache, Series):
     @property
     def _constructor(self):
         return TableSeries
@@ -113,6 +559,13 @@ class TableSeries(Series):
     def _constructor_expanddim(self):
         return Table
 
+    def _get_values(self, slobj):
+        # the slices of a Series are views, which pandas does not link to their parent
+        result = super()._get_values(slobj)
+        if isinstance(slobj, slice) and isinstance(result, TableSeries):
+            object.__setattr__(result, "_resample_parent_", weakref.ref(self))
+        return result
+
     sharpe = sharpe
 
     calmar = calmar
@@ -125,16 +578,38 @@ class TableSeries(Series):
 
     indicators = indicators
 
+    rolling_indicators = rolling_indicators
+
+    expanding_indicators = expanding_indicators
+
+    range_indicators = range_indicators
+
+    bootstrap_indicators = bootstrap_indicators
+
+    acf = acf
+
+    pacf = pacf
+
     cumulative = cumulative
 
+    save = save_table
+
     def as_df(self):
         return pd.Series(self)
 
     def autoplot(self, **kwargs):
+        from bokeh.plotting import show
+
         return show(qt.plot(self, **kwargs))
 
 
-class Table(DataFrame):
+class Table(_ResampleCache, DataFrame):
+    # propagated by pandas to the results of operations on the table
+    _metadata = ["is_stationnary", "is_normalized"]
+
+    is_stationnary = False
+    is_normalized = False
+
     @property
     def _constructor(self):
         return Table
@@ -153,14 +628,62 @@ class Table(DataFrame):
         ts=True,
         verbose=False,
         header=None,
+        chunksize=None,
+        date_format=None,
+        downcast=False,
+        start=None,
+        end=None,
     ):  # sourcery skip: low-code-quality
+        """
+        A DataFrame of time series. When data is a path, the file is read and its first datetime column
+        becomes the index.
+
+        :param header: the header row of csv and txt files, defaults to None
+        :param chunksize: stream csv and txt files by chunks of this many rows into a preallocated
+        array, instead of reading them at once, defaults to None
+        :param date_format: the strftime format of the datetime column, defaults to None (guessed from
+        its first value)
+        :param downcast: store the numeric columns of a file as float32, defaults to False
+        :param start: the first date to read from a parquet, feather or npy file, defaults to None
+        :param end: the last date to read from a parquet, feather or npy file, defaults to None
+
+        Parquet, feather and npy files (see Table.save) only load the requested columns and date
+        range: parquet and feather files, which need the optional pyarrow dependency, are filtered while
+        they are scanned, parquet skipping the row groups out of the range, and npy files are
+        memory-mapped and sliced.
+
+        The block manager that pandas passes when it builds the result of an operation takes a fast
+        path, without datetime sniffing nor verbose stats, see Table.from_frame.
+        """
+        if (
+            isinstance(data, BlockManager)
+            and index is None
+            and columns is None
+            and dtype is None
+        ):
+            DataFrame.__init__(self, data, copy=copy)
+            return
 
         if isinstance(data, str):
-            filetype = data.split(".")[-1]
+            filetype = data.rstrip("/").split(".")[-1]
             if filetype not in __authorized_filetype__:
                 raise ValueError(f"Filetype {filetype} is not supported")
+            if (start is not None or end is not None) and filetype not in __binary_filetype__:
+                raise ValueError(
+                    f"Date range reading is only supported for {__binary_filetype__} files"
+                )
+            if chunksize is not None and filetype not in ["csv", "txt"]:
+                raise ValueError(
+                    f"Chunked reading is only supported for csv and txt files, not {filetype}"
+                )
 
-            if filetype == "csv":
+            if filetype in __binary_filetype__:
+                data = load_table(data, columns, start, end)
+            elif chunksize is not None:
+                data = _read_csv_chunked(
+                    data, header, chunksize, date_format, downcast
+                )
+            elif filetype == "csv":
                 data = pd.read_csv(data, header=header)
             elif filetype == "json":
                 data = pd.read_json(data)
@@ -171,14 +694,20 @@ class Table(DataFrame):
 
             elif filetype == "txt":
                 data = pd.read_csv(data, sep=",", header=header)
+
+            if downcast and chunksize is None:
+                data = data.astype(
+                    {
+                        col: np.float32
+                        for col in data.select_dtypes(include="number").columns
+                    }
+                )
             super().__init__(data)
         else:
             super().__init__(
                 data=data, index=index, columns=columns, dtype=dtype, copy=copy  # type: ignore
             )
 
-        self.is_stationnary = False
-        self.is_normalized = False
         nb_rows, nb_cols = self.shape
 
         if verbose:
@@ -192,35 +721,30 @@ class Table(DataFrame):
                 print("Table has no NaN values")
 
         if ts and not pd.api.types.is_datetime64_any_dtype(self.index):
-            found = False
-            for col in self.columns:
-                first_value = self[col][0]
-                if isinstance(first_value, str):
-                    if re.match(r"\d{4}-\d{2}-\d{2}", first_value) or re.match(
-                        r"\d{2}/\d{2}/\d{4}", first_value
-                    ):
-                        self[col] = pd.to_datetime(self[col])
-                        self.set_index(col, inplace=True)
-                        logger.info(f"Column {col} is set as index")
-                        found = True
-                        break
-                elif isinstance(first_value, int):
-                    if first_value > 1e9:
-                        self[col] = pd.to_datetime(self[col], unit="s")
-                        self.set_index(col, inplace=True)
-                        logger.info(f"Column {col} is set as index")
-                        found = True
-                        break
-
-                elif pd.api.types.is_datetime64_any_dtype(first_value):
-                    self.set_index(col, inplace=True)
-                    logger.info(f"Column {col} is set as index")
-                    found = True
-                    break
+            col, kind = _find_datetime_column(self)
+            if col is not None:
+                self[col] = _parse_dates(self[col], kind, date_format)
+                self.set_index(col, inplace=True)
+                logger.info(f"Column {col} is set as index")
             self.index.name = "date"
-            if not found:
+            if col is None:
                 logger.info("No datetime column found")
 
+    @classmethod
+    def from_frame(cls, data):
+        """
+        It wraps a DataFrame, or a Series as a single column, as a Table sharing its data. There is no
+        datetime sniffing nor validation: this is the fast path for internal construction, in tight
+        loops
+
+        :param data: the DataFrame or Series
+        :type data: Union[DataFrame, Series]
+        :return: A Table
+        """
+        if isinstance(data, Series):
+            data = data.to_frame()
+        return cls(data._mgr)
+
     def __type__(self):
         return "Table"
 
@@ -233,6 +757,7 @@ class Table(DataFrame):
     def __new__(cls, *args, **kwargs):
         return super().__new__(cls)
 
+    @profiling.instrument
     def stationnarize(
         self,
         precision: float = 0.1,
@@ -240,6 +765,11 @@ class Table(DataFrame):
         order: Optional[Union[float, int]] = None,
         return_order: bool = False,
         inplace=False,
+        window_size: int = 10,
+        threshold: float = 1e-5,
+        n_jobs: Optional[int] = None,
+        search: str = "bisection",
+        cache=None,
     ):
         num = self.select_dtypes(include="number")
 
@@ -253,9 +783,15 @@ class Table(DataFrame):
                 method=method,
                 precision=precision,
                 rename=False,
+                window_size=window_size,
+                threshold=threshold,
+                n_jobs=n_jobs,
+                search=search,
+                cache=cache,
             )
 
         self.is_stationnary = True
+        self.cache_clear()
         diff_ = frac_diff(
             num,
             order=order,
@@ -263,10 +799,16 @@ class Table(DataFrame):
             method=method,
             precision=precision,
             rename=False,
+            window_size=window_size,
+            threshold=threshold,
+            n_jobs=n_jobs,
+            search=search,
+            cache=cache,
         )
         self[num.columns] = diff_[0] if return_order else diff_
         return None
 
+    @profiling.instrument
     def normalize(self, inplace=False):
         num = self.select_dtypes(include="number")
 
@@ -274,6 +816,7 @@ class Table(DataFrame):
             return (num - num.mean()) / num.std(ddof=0)
 
         self.is_normalized = True
+        self.cache_clear()
 
         self.loc[:, num.columns] = (num - num.mean()) / num.std(ddof=0)
         return None
@@ -293,12 +836,39 @@ class Table(DataFrame):
 
     indicators = indicators
 
+    rolling_indicators = rolling_indicators
+
+    expanding_indicators = expanding_indicators
+
+    range_indicators = range_indicators
+
+    bootstrap_indicators = bootstrap_indicators
+
+    acf = acf
+
+    pacf = pacf
+
     cumulative = cumulative
 
+    save = save_table
+
+    lazy = lazy
+
     def autoplot(self, **kwargs):
+        from bokeh.models import TabPanel, Tabs
+        from bokeh.plotting import show
+
+        # the statistics of all the columns are computed at once, as for qt.report
+        stats = qt.plotting._report.report_statistics(self)
         tabs = [
-            TabPanel(child=qt.plot(self.loc[:, col], **kwargs), title=col)  # type: ignore weird cause TableSeries
-            for col in self.columns
-            if pd.api.types.is_numeric_dtype(self[col])
+            TabPanel(
+                child=qt.plot(
+                    self.loc[:, col],  # type: ignore weird cause TableSeries
+                    stats=qt.plotting._report.column_stats(stats, col),
+                    **kwargs,
+                ),
+                title=col,
+            )
+            for col in stats["indicators"].columns
         ]
         show(Tabs(tabs=tabs))
@@ -0,0 +1,86 @@
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+
+def _as_2d(X):
+    values = np.asarray(X, dtype=float)
+    return values.reshape(len(values), -1)
+
+
+def _wrap(X, values: np.ndarray):
+    # the same type as X, indexed by the lags
+    lags = pd.RangeIndex(len(values), name="lag")
+    if isinstance(X, pd.DataFrame):
+        return pd.DataFrame(values, index=lags, columns=X.columns)
+    if isinstance(X, pd.Series):
+        return pd.Series(values[:, 0], index=lags, name=X.name)
+    return values[:, 0] if np.ndim(X) == 1 else values
+
+
+def _acf(values: np.ndarray, nlags: int) -> np.ndarray:
+    # (nlags + 1, n_columns) autocorrelations, the autocovariances being the inverse FFT of the
+    # power spectrum of the centered series zero-padded to avoid the circular wrap
+    from scipy.fft import irfft, next_fast_len, rfft  # imported on the first use, with scipy.special
+
+    n_rows = len(values)
+    centered = values - np.nanmean(values, axis=0)
+    centered[np.isnan(centered)] = 0
+
+    size = next_fast_len(2 * n_rows - 1)
+    spectrum = rfft(centered, n=size, axis=0)
+    spectrum *= spectrum.conj()
+    autocov = irfft(spectrum, n=size, axis=0)[: nlags + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return autocov / autocov[0]
+
+
+def acf(
+    X: Union[pd.Series, pd.DataFrame, np.ndarray], nlags: int = 40
+) -> Union[pd.Series, pd.DataFrame, np.ndarray]:
+    """
+    Autocorrelation function of every column at once, in O(T log T) with an FFT. It matches
+    statsmodels.tsa.stattools.acf (NaN are skipped)
+
+    :param X: the series, one per column
+    :type X: Union[pd.Series, pd.DataFrame, np.ndarray]
+    :param nlags: the number of lags, defaults to 40
+    :type nlags: int
+    :return: the autocorrelations of the lags 0 to nlags, with the type and columns of X
+    """
+    values = _as_2d(X)
+    return _wrap(X, _acf(values, min(nlags, len(values) - 1)))
+
+
+def pacf(
+    X: Union[pd.Series, pd.DataFrame, np.ndarray], nlags: int = 40
+) -> Union[pd.Series, pd.DataFrame, np.ndarray]:
+    """
+    Partial autocorrelation function of every column at once: the Yule-Walker estimates, solved with
+    the Durbin-Levinson recursion on the FFT autocorrelations. It matches
+    statsmodels.tsa.stattools.pacf with method="ldb"
+
+    :param X: the series, one per column
+    :type X: Union[pd.Series, pd.DataFrame, np.ndarray]
+    :param nlags: the number of lags, defaults to 40
+    :type nlags: int
+    :return: the partial autocorrelations of the lags 0 to nlags, with the type and columns of X
+    """
+    values = _as_2d(X)
+    nlags = min(nlags, len(values) - 1)
+    r = _acf(values, nlags)
+
+    out = np.empty_like(r)
+    out[0] = 1
+    phi = np.zeros((nlags, r.shape[1]))  # phi[j - 1] is the coefficient of lag j of the AR(k) fit
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for k in range(1, nlags + 1):
+            previous = phi[: k - 1]
+            phi_kk = (r[k] - np.einsum("jc,jc->c", previous, r[k - 1 : 0 : -1])) / (
+                1 - np.einsum("jc,jc->c", previous, r[1:k])
+            )
+            phi[: k - 1] = previous - phi_kk * previous[::-1]
+            phi[k - 1] = phi_kk
+            out[k] = phi_kk
+    return _wrap(X, out)
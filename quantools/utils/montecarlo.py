@@ -0,0 +1,142 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..table._indicators import indicators_kernel
+from ..table._table import __available_indicators__
+from .sample_data import Seed, simulate_brownian_paths, spawn_seeds
+
+
+def _indicators_batch(
+    seed: np.random.SeedSequence,
+    n_paths: int,
+    n_periods: int,
+    drift: float,
+    vol: float,
+    dt: float,
+    risk_free: float,
+    dtype,
+) -> Dict[str, np.ndarray]:
+    # runs in a worker process: only the seed goes in and the indicators come out
+    returns = simulate_brownian_paths(
+        n_periods - 1,
+        n_paths,
+        drift=drift,
+        vol=vol,
+        dt=dt,
+        returns=True,
+        seed=seed,
+        dtype=dtype,
+    )
+    return indicators_kernel(returns, risk_free)
+
+
+def _run(tasks, executor: Executor):
+    futures = [executor.submit(_indicators_batch, *task) for task in tasks]
+    return [future.result() for future in futures]
+
+
+def monte_carlo_indicators(
+    n_paths: int,
+    n_periods: int,
+    drift: float = 0,
+    vol: float = 1,
+    dt: float = 1,
+    risk_free: float = 0,
+    quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95),
+    confidence: float = 0.95,
+    batch_size: int = 1000,
+    seed: Seed = None,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    return_samples: bool = False,
+    dtype=np.float64,
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    It estimates the sampling distribution of the indicators of Brownian returns (the paths of
+    generate_brownian_returns). The paths are simulated by batches, each batch having its own seed
+    sequence spawned from seed, and the indicators are computed on the whole batch array at once. The
+    batches can run on a process pool: the results only depend on seed and batch_size, not on the
+    number of workers.
+
+    :param n_paths: the number of paths
+    :type n_paths: int
+    :param n_periods: the number of periods of a path, as in generate_brownian_returns
+    :type n_periods: int
+    :param drift: the mean of the log returns, defaults to 0
+    :type drift: float
+    :param vol: the volatility of the log returns, defaults to 1
+    :type vol: float
+    :param dt: the time step, defaults to 1
+    :type dt: float
+    :param risk_free: the risk free rate, defaults to 0
+    :type risk_free: float
+    :param quantiles: the quantiles of the indicators, defaults to (0.05, 0.25, 0.5, 0.75, 0.95)
+    :type quantiles: Sequence[float]
+    :param confidence: the level of the confidence interval of the mean, defaults to 0.95
+    :type confidence: float
+    :param batch_size: the number of paths simulated together, defaults to 1000
+    :type batch_size: int
+    :param seed: the root seed, seed sequence or generator (see spawn_seeds), defaults to None
+    :type seed: Union[None, int, np.random.SeedSequence, np.random.Generator]
+    :param n_jobs: the number of worker processes, -1 for all the cores, defaults to None (sequential)
+    :type n_jobs: Optional[int]
+    :param executor: a process pool to run the batches on, instead of n_jobs
+    :type executor: Optional[Executor]
+    :param return_samples: also return the indicators of every path, defaults to False
+    :type return_samples: bool
+    :param dtype: the dtype of the simulated returns, np.float64 or np.float32
+    :return: A DataFrame with one row per indicator: mean, std, the confidence interval of the mean
+    and the quantiles. With return_samples, also the (n_paths, indicators) DataFrame of the samples
+    """
+    if n_paths < 1:
+        raise ValueError("n_paths must be positive")
+
+    starts = range(0, n_paths, batch_size)
+    tasks = [
+        (child, min(batch_size, n_paths - first), n_periods)
+        + (drift, vol, dt, risk_free, dtype)
+        for first, child in zip(starts, spawn_seeds(seed, len(starts)))
+    ]
+
+    if executor is not None:
+        batches = _run(tasks, executor)
+    elif n_jobs is not None and n_jobs != 1:
+        max_workers = os.cpu_count() if n_jobs < 0 else n_jobs
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            batches = _run(tasks, pool)
+    else:
+        batches = [_indicators_batch(*task) for task in tasks]
+
+    samples = pd.DataFrame(
+        {
+            name: np.concatenate([batch[name] for batch in batches])
+            for name in __available_indicators__
+        }
+    )
+
+    # imported on the first use, not with quantools
+    from scipy.special import ndtri
+
+    values = samples.to_numpy()
+    with np.errstate(invalid="ignore"):
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0, ddof=1)
+        n = (~np.isnan(values)).sum(axis=0)
+        half_width = ndtri((1 + confidence) / 2) * std / np.sqrt(n)
+        summary = pd.DataFrame(
+            {
+                "mean": mean,
+                "std": std,
+                "mean_low": mean - half_width,
+                "mean_high": mean + half_width,
+            },
+            index=__available_indicators__,
+        )
+        for q, value in zip(quantiles, np.nanquantile(values, quantiles, axis=0)):
+            summary[f"q{q:g}"] = value
+
+    return (summary, samples) if return_samples else summary
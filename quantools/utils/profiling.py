@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+from functools import wraps
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# the innermost active profile, None when profiling is off: the hooks then only test this global
+_active: Optional["Profile"] = None
+
+
+def _shape(args: tuple) -> tuple:
+    # the rows and columns of the first argument with a shape
+    for arg in args:
+        shape = getattr(arg, "shape", None)
+        if shape is not None and len(shape):
+            return shape[0], shape[1] if len(shape) > 1 else 1
+    return 0, 0
+
+
+def _nbytes(result) -> int:
+    # the size of the result, the first element of a tuple (e.g. the series and their orders)
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(index=False).sum())
+    if isinstance(result, pd.Series):
+        return int(result.memory_usage(index=False))
+    return 0
+
+
+class Profile:
+    """
+    The calls of the instrumented operations (the Table metrics, stationnarize, normalize, the stages
+    of FractionalDiff, the ADF tests, the convolutions and the daily resampling) made while the
+    profile is active. Only the calls of the process are recorded, not those of worker processes.
+    """
+
+    def __init__(self) -> None:
+        self.events: list = []
+        self._stacks = threading.local()
+        self._previous: Optional[Profile] = None
+        self._origin = time.perf_counter_ns()
+
+    def __enter__(self) -> "Profile":
+        global _active
+        self._previous, _active = _active, self
+        self._origin = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _active
+        _active = self._previous
+
+    def call(self, name: str, func, args: tuple, kwargs: dict):
+        # the time spent in the instrumented calls nested in this one, to get its self time
+        stack = getattr(self._stacks, "children", None)
+        if stack is None:
+            stack = self._stacks.children = []
+        stack.append(0)
+        result = None
+        start = time.perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            duration = time.perf_counter_ns() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += duration
+            self.events.append(
+                (
+                    name,
+                    start - self._origin,
+                    duration,
+                    duration - children,
+                    *_shape(args),
+                    _nbytes(result),
+                    threading.get_ident(),
+                )
+            )
+
+    def summary(self) -> pd.DataFrame:
+        """
+        :return: A DataFrame with one row per operation, sorted by total time: the number of calls, the
+        total, self (without the nested instrumented calls), mean and max times in seconds, the rows and
+        columns processed and the bytes of the results, summed over the calls
+        """
+        events = pd.DataFrame(
+            self.events,
+            columns=["name", "start", "duration", "self", "rows", "columns", "nbytes", "thread"],
+        )
+        grouped = events.groupby("name")
+        summary = pd.DataFrame(
+            {
+                "calls": grouped.size(),
+                "total_s": grouped["duration"].sum() / 1e9,
+                "self_s": grouped["self"].sum() / 1e9,
+                "mean_s": grouped["duration"].mean() / 1e9,
+                "max_s": grouped["duration"].max() / 1e9,
+                "rows": grouped["rows"].sum(),
+                "columns": grouped["columns"].sum(),
+                "nbytes": grouped["nbytes"].sum(),
+            }
+        )
+        return summary.sort_values("total_s", ascending=False)
+
+    def chrome_trace(self, path: Optional[str] = None) -> dict:
+        """
+        The calls in the Chrome trace event format, to open in chrome://tracing or Perfetto
+
+        :param path: a JSON file to write the trace to, defaults to None
+        :type path: Optional[str]
+        :return: the trace
+        """
+        pid = os.getpid()
+        trace = {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": "quantools",
+                    "ph": "X",
+                    "ts": start / 1e3,
+                    "dur": duration / 1e3,
+                    "pid": pid,
+                    "tid": thread,
+                    "args": {"rows": rows, "columns": columns, "nbytes": nbytes},
+                }
+                for name, start, duration, _, rows, columns, nbytes, thread in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump(trace, f)
+        return trace
+
+
+def profile() -> Profile:
+    """
+    It records the calls of the quantools operations made in its block. Profiling is off otherwise,
+    and then costs a test of a global per instrumented call.
+
+        with qt.profile() as prof:
+            table.stationnarize()
+        prof.summary()
+        prof.chrome_trace("trace.json")
+
+    :return: the profile, a context manager
+    """
+    return Profile()
+
+
+def instrument(func):
+    """
+    It records the calls of func in the active profile, under its qualified name
+    """
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if _active is None:
+            return func(*args, **kwargs)
+        return _active.call(name, func, args, kwargs)
+
+    return wrapper
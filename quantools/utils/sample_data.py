@@ -1,11 +1,138 @@
+from typing import Iterator, List, Optional, Union
+
 import numpy as np
 import pandas as pd
 
 import quantools as qt
 
+Seed = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def spawn_seeds(seed: Seed, n_streams: int) -> List[np.random.SeedSequence]:
+    """
+    It spawns independent seed sequences from a root seed, one per process or per block of paths, so
+    that parallel simulations are reproducible and do not overlap
+
+    :param seed: the root seed, seed sequence or generator. A generator spawns from the seed
+    sequence it was built from, so successive calls give new streams
+    :type seed: Union[None, int, np.random.SeedSequence, np.random.Generator]
+    :param n_streams: the number of streams
+    :type n_streams: int
+    :return: A list of seed sequences, to pass as the seed of simulate_brownian_paths
+    """
+    if isinstance(seed, np.random.Generator):
+        # seed_seq is public from numpy 1.25, only the private attribute exists before
+        bit_generator = seed.bit_generator
+        seed = getattr(bit_generator, "seed_seq", None) or bit_generator._seed_seq
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n_streams)
+
+
+def simulate_brownian_paths(
+    n_periods: int,
+    n_paths: int,
+    drift: Union[float, np.ndarray] = 0,
+    vol: Union[float, np.ndarray] = 1,
+    dt: float = 1,
+    s0: float = 1,
+    corr: Optional[np.ndarray] = None,
+    returns: bool = False,
+    seed: Seed = None,
+    dtype=np.float64,
+) -> np.ndarray:
+    """
+    It simulates geometric Brownian paths in a single array, the increments being exponentiated and
+    accumulated in place
+
+    :param n_periods: the number of periods
+    :type n_periods: int
+    :param n_paths: the number of paths
+    :type n_paths: int
+    :param drift: the mean of the log increments, per asset with corr, defaults to 0
+    :type drift: Union[float, np.ndarray]
+    :param vol: the volatility of the log increments, per asset with corr, defaults to 1
+    :type vol: Union[float, np.ndarray]
+    :param dt: the time step, defaults to 1
+    :type dt: float
+    :param s0: the initial price, defaults to 1
+    :type s0: float
+    :param corr: the correlation matrix of the assets, each path then being a path of every asset,
+    defaults to None
+    :type corr: Optional[np.ndarray]
+    :param returns: return the simple returns of the periods instead of the prices, defaults to False
+    :type returns: bool
+    :param seed: the seed, seed sequence (see spawn_seeds) or generator, defaults to None
+    :type seed: Union[None, int, np.random.SeedSequence, np.random.Generator]
+    :param dtype: np.float64 or np.float32, defaults to np.float64
+    :return: The (n_periods, n_paths) array, (n_periods, n_paths, n_assets) with corr
+    """
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+    shape = (n_periods, n_paths) if corr is None else (n_periods, n_paths, len(corr))
+    paths = rng.standard_normal(shape, dtype=dtype)
+    if corr is not None:
+        paths = paths @ np.linalg.cholesky(np.asarray(corr, dtype=dtype)).T
+
+    paths *= np.asarray(vol, dtype=dtype) * np.sqrt(dt)
+    paths += np.asarray(drift, dtype=dtype) * dt
+
+    if returns:
+        # the return of a period is exp(increment) - 1
+        return np.expm1(paths, out=paths)
+
+    np.cumsum(paths, axis=0, out=paths)
+    np.exp(paths, out=paths)
+    paths *= s0
+    return paths
+
+
+def iter_brownian_paths(
+    n_paths: int, n_periods: int, chunk_size: int = 10_000, seed: Seed = None, **kwargs
+) -> Iterator[np.ndarray]:
+    """
+    It yields the paths by blocks of chunk_size paths, so that they never all are in memory. Each
+    block has its own spawned seed sequence: the paths only depend on the seed and on chunk_size
+
+    :param n_paths: the number of paths
+    :type n_paths: int
+    :param n_periods: the number of periods
+    :type n_periods: int
+    :param chunk_size: the number of paths of a block, defaults to 10_000
+    :type chunk_size: int
+    :param seed: the root seed, seed sequence or generator (see spawn_seeds), defaults to None
+    :type seed: Union[None, int, np.random.SeedSequence, np.random.Generator]
+    :param kwargs: the parameters of simulate_brownian_paths
+    :return: An iterator of (n_periods, chunk_size) arrays, the last one being smaller
+    """
+    starts = range(0, n_paths, chunk_size)
+    for first, child in zip(starts, spawn_seeds(seed, len(starts))):
+        yield simulate_brownian_paths(
+            n_periods, min(chunk_size, n_paths - first), seed=child, **kwargs
+        )
+
+
+def _asset_paths(n_timeseries, n_periods, corr, **kwargs):
+    if corr is None:
+        return simulate_brownian_paths(n_periods, n_timeseries, **kwargs)
+    if len(corr) != n_timeseries:
+        raise ValueError(
+            f"The correlation matrix is {len(corr)}x{len(corr)} for {n_timeseries} timeseries"
+        )
+    return simulate_brownian_paths(n_periods, 1, corr=corr, **kwargs)[:, 0]
+
 
 def generate_brownian_prices(
-    n_timeseries, n_periods: int, drift: float = 0, vol: float = 1, s0: float = 1, dt=1
+    n_timeseries,
+    n_periods: int,
+    drift: float = 0,
+    vol: float = 1,
+    s0: float = 1,
+    dt=1,
+    seed: Seed = None,
+    dtype=np.float64,
+    corr: Optional[np.ndarray] = None,
+    freq: str = "1D",
 ):
     """
 
@@ -22,22 +149,27 @@ def generate_brownian_prices(
     :param s0: the initial price of the asset, defaults to 1
     :type s0: float (optional)
     :param dt: The time step, defaults to 1 (optional)
+    :param seed: the seed of the generator, defaults to None (optional)
+    :param dtype: np.float64 or np.float32, defaults to np.float64 (optional)
+    :param corr: the correlation matrix of the assets, defaults to None (optional)
+    :param freq: the frequency of the timestamps, e.g. "1min" for long series, defaults to "1D"
     :return: A table with the prices of the assets, the index is the timestamps and the columns are the
     assets.
     """
 
-    # Generate Brownian motion increments.
-
-    increments = np.random.normal(
-        loc=drift * dt, scale=vol * np.sqrt(dt), size=(n_periods, n_timeseries)
+    prices = _asset_paths(
+        n_timeseries,
+        n_periods,
+        corr,
+        drift=drift,
+        vol=vol,
+        dt=dt,
+        s0=s0,
+        seed=seed,
+        dtype=dtype,
     )
-    increments = increments.reshape((n_periods, n_timeseries))
-
-    # Generate Brownian motion prices.
-
-    prices = s0 * np.exp(np.cumsum(increments, axis=0))
 
-    timestamps = pd.date_range(start="2020-01-01", periods=n_periods, freq="1D")
+    timestamps = pd.date_range(start="2020-01-01", periods=n_periods, freq=freq)
 
     return qt.Table(
         prices, index=timestamps, columns=[f"asset_{i}" for i in range(n_timeseries)]
@@ -45,7 +177,15 @@ def generate_brownian_prices(
 
 
 def generate_brownian_returns(
-    n_timeseries: int, n_periods: int, drift: float = 0, vol: float = 1, dt=1
+    n_timeseries: int,
+    n_periods: int,
+    drift: float = 0,
+    vol: float = 1,
+    dt=1,
+    seed: Seed = None,
+    dtype=np.float64,
+    corr: Optional[np.ndarray] = None,
+    freq: str = "1D",
 ):
 
     """
@@ -54,25 +194,33 @@ def generate_brownian_returns(
 
     :param n_timeseries: the number of timeseries to generate
     :type n_timeseries: int
-    :param n_periods: the number of periods to generate
+    :param n_periods: the number of periods to generate, the returns being their n_periods - 1 changes
     :type n_periods: int
     :param drift: the expected return of the asset, defaults to 0
     :type drift: float (optional)
     :param vol: the volatility of the returns, defaults to 1
     :type vol: float (optional)
     :param dt: The time step of the simulation, defaults to 1 (optional)
+    :param seed: the seed of the generator, defaults to None (optional)
+    :param dtype: np.float64 or np.float32, defaults to np.float64 (optional)
+    :param corr: the correlation matrix of the assets, defaults to None (optional)
+    :param freq: the frequency of the timestamps, e.g. "1min" for long series, defaults to "1D"
     :return: A table with returns, index, and columns
     """
 
-    increments = np.random.normal(
-        loc=drift * dt, scale=vol * np.sqrt(dt), size=(n_periods, n_timeseries)
-    ).reshape((n_periods, n_timeseries))
-
-    prices = np.exp(np.cumsum(increments, axis=0))
-
-    returns = prices[1:, :] / prices[:-1, :] - 1
+    returns = _asset_paths(
+        n_timeseries,
+        n_periods - 1,
+        corr,
+        drift=drift,
+        vol=vol,
+        dt=dt,
+        returns=True,
+        seed=seed,
+        dtype=dtype,
+    )
 
-    timestamps = pd.date_range(start="2020-01-01", periods=n_periods - 1, freq="1D")
+    timestamps = pd.date_range(start="2020-01-01", periods=n_periods - 1, freq=freq)
 
     return qt.Table(
         returns,
@@ -0,0 +1,19 @@
+import numpy as np
+from quantools import acf, generate_brownian_returns, pacf
+from statsmodels.tsa.stattools import acf as sm_acf
+from statsmodels.tsa.stattools import pacf as sm_pacf
+
+
+def test_acf_pacf():
+    table = generate_brownian_returns(n_timeseries=3, n_periods=500, seed=0)
+    table.iloc[10, 1] = np.nan
+
+    autocorr, partial = table.acf(nlags=20), table.pacf(nlags=20)
+    assert autocorr.shape == (21, 3) and (autocorr.iloc[0] == 1).all()
+
+    for col in [table.columns[0], table.columns[2]]:
+        assert np.allclose(autocorr[col], sm_acf(table[col], nlags=20, fft=True))
+        assert np.allclose(partial[col], sm_pacf(table[col], nlags=20, method="ldb"))
+
+    assert np.allclose(acf(table.iloc[:, 0].to_numpy(), 5), autocorr.iloc[:6, 0])
+    assert np.allclose(pacf(table.iloc[:, 0], 5), partial.iloc[:6, 0])
@@ -1,7 +1,17 @@
 import numpy as np
 import pandas as pd
+from functools import partial
 from typing import List
-from quantools import FractionalDiff, generate_brownian_prices
+from scipy.special import binom
+from quantools import (
+    DiskCache,
+    FractionalDiff,
+    StreamingFractionalDiff,
+    generate_brownian_prices,
+)
+from quantools.processing._adf import adfuller_pvalue
+from quantools.processing._utils import ffd_weights
+from statsmodels.tsa.stattools import adfuller
 
 
 def test_FractionalDiff(n_col: int = 10):
@@ -19,5 +29,143 @@ def test_FractionalDiff(n_col: int = 10):
     assert len(orders) == n_col and len(np.unique(orders)) > 1  #type: ignore
 
 
+def test_diff_matches_rolling_convolution():
+    X = generate_brownian_prices(n_timeseries=3, n_periods=200, vol=1e-2)
+    X.iloc[20, 1] = np.nan
+
+    diff = FractionalDiff()
+    for order in [0.35, 1, 1.5]:
+        coeffs = (-1) ** np.arange(10) * binom(order, np.arange(10))
+        expected = X.rolling(10).apply(partial(np.convolve, coeffs, mode="valid"), raw=True)
+        if order == 1:
+            expected = X - X.shift(1)
+        assert np.allclose(diff._diff(X, order), expected, equal_nan=True)
+        assert np.allclose(
+            diff(X.to_numpy(), order=order), expected, equal_nan=True
+        )
+
+
+def test_ffd_weights():
+    weights = ffd_weights(0.4, 1e-4)
+    assert np.allclose(weights, (-1) ** np.arange(len(weights)) * binom(0.4, np.arange(len(weights))))
+    assert abs(weights[-1]) >= 1e-4 and abs(binom(0.4, len(weights))) < 1e-4
+    assert ffd_weights(0.4, 1e-4) is weights  # cached
+    assert np.allclose(ffd_weights(1, 1e-4), [1, -1])
+
+
+def test_ffd():
+    X = generate_brownian_prices(n_timeseries=4, n_periods=500, drift=1e-2, vol=1e-3)
+
+    diff = FractionalDiff()
+    X_diff, orders = diff(X, method="ffd", threshold=1e-3, return_order=True)
+    window_size = len(ffd_weights(orders[0], 1e-3))
+    assert X_diff.iloc[:, 0].isna().sum() == window_size - 1
+
+
+def test_parallel_autodiff():
+    X = generate_brownian_prices(n_timeseries=4, n_periods=200, drift=1e-2, vol=1e-3)
+
+    diff = FractionalDiff()
+    X_diff, orders = diff(X, return_order=True)
+    X_diff_parallel, orders_parallel = diff(X, return_order=True, n_jobs=2)
+    assert orders_parallel == orders
+    assert np.allclose(X_diff_parallel, X_diff, equal_nan=True)
+    assert list(X_diff_parallel.columns) == list(X_diff.columns)
+
+
+def test_adfuller_pvalue():
+    X = generate_brownian_prices(n_timeseries=6, n_periods=300, vol=1e-2).to_numpy()
+    X[:, 3:] = np.diff(np.log(X), axis=0, prepend=0)[:, 3:]
+
+    pvalues = adfuller_pvalue(X)
+    for col in range(X.shape[1]):
+        assert np.isclose(pvalues[col], adfuller(X[:, col])[1])
+        assert np.isclose(
+            adfuller_pvalue(X[:, col], maxlag=3, autolag=None),
+            adfuller(X[:, col], maxlag=3, autolag=None)[1],
+        )
+
+
+def test_autodiff_memoized_and_warm(monkeypatch):
+    import quantools.processing.fractionaldiff as fractionaldiff
+
+    X = generate_brownian_prices(n_timeseries=3, n_periods=300, drift=1e-3, vol=1e-2)
+    X = pd.concat([X, X * 1.01], axis=1)
+
+    diff = FractionalDiff()
+    _, orders = diff(X, return_order=True, precision=0.01)
+
+    def no_test(_):
+        raise AssertionError("the ADF test should not run")
+
+    monkeypatch.setattr(fractionaldiff, "adf_pvalue", no_test)
+    _, orders_again = diff(X, return_order=True, precision=0.01)
+    _, orders_warm = diff(X, return_order=True, precision=0.01, search="warm")
+    assert orders_again == orders and orders_warm == orders
+
+
+def test_streaming_matches_batch():
+    X = generate_brownian_prices(n_timeseries=3, n_periods=100, vol=1e-2)
+
+    for method, order in [("fixed-window", 0.4), ("fixed-window", 1), ("ffd", 0.6)]:
+        expected = FractionalDiff()._diff(X, order, method=method, threshold=1e-3)
+        stream = StreamingFractionalDiff(order, method=method, threshold=1e-3)
+        chunks = [stream.update(X.iloc[:3]), stream.update(X.iloc[3:4].to_numpy())]
+        chunks += [stream.update(X.iloc[i]).to_frame().T for i in range(4, 50)]
+        chunks.append(stream.update(X.iloc[50:]))
+        streamed = np.vstack([np.asarray(chunk, dtype=float) for chunk in chunks])
+        assert np.array_equal(streamed, expected.to_numpy(), equal_nan=True)
+
+
+def test_disk_cache(tmp_path, monkeypatch):
+    import quantools.processing.fractionaldiff as fractionaldiff
+
+    X = generate_brownian_prices(n_timeseries=3, n_periods=300, drift=1e-3, vol=1e-2)
+    history, appended = X.iloc[:250], X
+
+    diff = FractionalDiff()
+    cached, orders = diff(history, return_order=True, cache=str(tmp_path))
+    assert len(DiskCache(str(tmp_path))) == 3
+
+    def no_search(*args, **kwargs):
+        raise AssertionError("the order search should not run")
+
+    monkeypatch.setattr(fractionaldiff.FractionalDiff, "_search_columns", no_search)
+    diff = FractionalDiff()
+    again, orders_again = diff(history, return_order=True, cache=str(tmp_path))
+    assert orders_again == orders and again.equals(cached)
+
+    # append-only: the cached orders are reused and only the new rows are differenced
+    tail, orders_tail = diff(appended, return_order=True, cache=str(tmp_path))
+    expected = pd.concat(
+        [
+            diff._diff(appended.iloc[:, i], order) if order else appended.iloc[:, i]
+            for i, order in enumerate(orders)
+        ],
+        axis=1,
+    )
+    assert orders_tail == orders
+    assert np.allclose(tail, expected, equal_nan=True)
+
+    cache = DiskCache(str(tmp_path), max_bytes=2 * 250 * 8)
+    cache.put(np.arange(10.0), ("fixed-window", 0.1, 10), 0.5, np.arange(10.0))
+    assert cache.nbytes <= cache.max_bytes
+
+    # the prefix of a column is found among entries with other parameters and lengths
+    column = appended.iloc[:, 0].to_numpy()
+    cache.put(column[:100], ("fixed-window", 0.1, 10), 0.3, np.zeros(100))
+    cache.put(column[:100], ("other", 0.1, 10), 0.7, np.ones(100))
+    order, prefix = cache.get(column, ("fixed-window", 0.1, 10))
+    assert order == 0.3 and len(prefix) == 100
+    assert cache.get(column, ("missing",)) is None
+
+    # a table of a single column, and a series, are cached too
+    monkeypatch.undo()
+    single = DiskCache(str(tmp_path / "single"))
+    diff(X.iloc[:, :1], cache=single)
+    diff(X.iloc[:, 1], cache=single)
+    assert len(single) == 2
+
+
 if __name__ == "__main__":
     test_FractionalDiff()
@@ -0,0 +1,16 @@
+import os
+import subprocess
+import sys
+
+
+def test_import_is_light():
+    # bokeh and scipy are only imported on the first use of the functions that need them
+    code = (
+        "import sys, quantools as qt\n"
+        "qt.generate_brownian_returns(n_timeseries=2, n_periods=50, seed=0).indicators()\n"
+        "assert not {'bokeh', 'matplotlib', 'seaborn', 'scipy'} & set(sys.modules), sys.modules\n"
+        "qt.plot\n"
+        "assert 'bokeh' in sys.modules\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
@@ -0,0 +1,28 @@
+import numpy as np
+from quantools import generate_brownian_returns, monte_carlo_indicators
+from quantools.utils.sample_data import spawn_seeds
+
+
+def test_monte_carlo_indicators():
+    summary, samples = monte_carlo_indicators(
+        300, 252, vol=1e-2, seed=0, batch_size=300, return_samples=True
+    )
+
+    # a single batch simulates the returns of generate_brownian_returns with its seed
+    table = generate_brownian_returns(300, 252, vol=1e-2, seed=spawn_seeds(0, 1)[0])
+    assert np.allclose(samples.to_numpy(), table.indicators().T.to_numpy())
+    assert np.allclose(summary["mean"], samples.mean())
+    assert (summary["mean_low"] < summary["mean"]).all()
+    assert (summary["q0.05"] <= summary["q0.95"]).all()
+
+    sequential = monte_carlo_indicators(500, 100, vol=1e-2, seed=1, batch_size=100)
+    parallel = monte_carlo_indicators(
+        500, 100, vol=1e-2, seed=1, batch_size=100, n_jobs=2
+    )
+    assert sequential.equals(parallel)
+
+    # a generator seeds the batches with the streams of its seed sequence
+    from_rng = monte_carlo_indicators(
+        500, 100, vol=1e-2, seed=np.random.default_rng(1), batch_size=100
+    )
+    assert sequential.equals(from_rng)
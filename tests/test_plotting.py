@@ -0,0 +1,36 @@
+import os
+
+import numpy as np
+import pandas as pd
+from quantools import generate_brownian_returns, report
+from quantools.plotting._downsample import downsample, lttb_indices, minmax_indices
+
+
+def test_downsample():
+    y = np.random.default_rng(0).normal(size=100_000).cumsum()
+    index = pd.date_range("2020-01-01", periods=len(y), freq="1min")
+
+    kept = minmax_indices(y, 500)
+    assert len(kept) <= 1002 and y.argmax() in kept and y.argmin() in kept
+
+    kept = lttb_indices(np.arange(len(y)), y, 1000)
+    assert len(kept) == 1000 and kept[0] == 0 and kept[-1] == len(y) - 1
+    assert np.all(np.diff(kept) > 0)
+
+    kept = downsample(index, y, 1000, "lttb", keep=[12345])
+    assert 12345 in kept and len(kept) <= 1001
+    assert np.array_equal(downsample(index, y[:500], 1000), np.arange(500))
+
+
+def test_report(tmp_path):
+    table = generate_brownian_returns(n_timeseries=3, n_periods=300, vol=1e-2, seed=0)
+    table.columns = ["a", "b/c", "d"]
+
+    paths, timings = report(table, str(tmp_path / "reports"), return_timings=True)
+    assert [os.path.basename(path) for path in paths] == ["a.html", "b_c.html", "d.html"]
+    assert set(timings) == {"statistics", "layouts", "html", "total"}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        # the logo is embedded, nothing is fetched but BokehJS
+        assert "data:image/png;base64," in html and "githubusercontent" not in html
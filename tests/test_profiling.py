@@ -0,0 +1,24 @@
+import json
+
+from quantools import generate_brownian_prices, profile
+
+
+def test_profile(tmp_path):
+    X = generate_brownian_prices(n_timeseries=3, n_periods=300, drift=1e-3, vol=1e-2, seed=0)
+    with profile() as prof:
+        X.stationnarize(order=0.5)
+        X.sharpe()
+    X.sharpe()  # not recorded
+
+    summary = prof.summary()
+    assert summary.loc["Table.sharpe", "calls"] == 1
+    assert summary.loc["FractionalDiff._diff", "rows"] == 300
+    assert summary.loc["frac_diff", "nbytes"] == 300 * 3 * 8
+    assert (summary["self_s"] <= summary["total_s"]).all()
+    assert "daily_resampler" in summary.index and "adf_pvalue" not in summary.index
+
+    prof.chrome_trace(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == summary["calls"].sum()
+    assert {event["ph"] for event in events} == {"X"}
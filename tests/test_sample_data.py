@@ -0,0 +1,28 @@
+import numpy as np
+from quantools import generate_brownian_prices, iter_brownian_paths, simulate_brownian_paths
+
+
+def test_simulate_brownian_paths():
+    first = generate_brownian_prices(n_timeseries=3, n_periods=50, seed=0)
+    assert first.equals(generate_brownian_prices(n_timeseries=3, n_periods=50, seed=0))
+    # long series need a finer index than days, which end in 2262
+    minutes = generate_brownian_prices(n_timeseries=1, n_periods=200_000, seed=0, freq="1min")
+    assert minutes.index[1] - minutes.index[0] == np.timedelta64(1, "m")
+
+    paths = simulate_brownian_paths(5000, 2, vol=1e-2, seed=1, dtype=np.float32)
+    assert paths.dtype == np.float32 and paths.shape == (5000, 2)
+
+    corr = np.array([[1.0, 0.7], [0.7, 1.0]])
+    returns = simulate_brownian_paths(
+        20000, 1, vol=1e-2, corr=corr, returns=True, seed=2
+    )
+    assert abs(np.corrcoef(returns[:, 0].T)[0, 1] - 0.7) < 0.02
+
+    chunks = list(iter_brownian_paths(25, 10, chunk_size=10, seed=3))
+    assert [chunk.shape for chunk in chunks] == [(10, 10), (10, 10), (10, 5)]
+    again = list(iter_brownian_paths(25, 10, chunk_size=10, seed=3))
+    assert all(np.array_equal(a, b) for a, b in zip(chunks, again))
+
+    # a generator spawns the streams of its seed sequence
+    from_rng = list(iter_brownian_paths(25, 10, chunk_size=10, seed=np.random.default_rng(3)))
+    assert all(np.array_equal(a, b) for a, b in zip(chunks, from_rng))
@@ -1,6 +1,7 @@
-from quantools import Table, TableSeries
+from quantools import LazyTable, Table, TableSeries, generate_brownian_returns
 from quantools.processing._utils import isStationnary
 import pandas as pd
+import pytest
 import numpy as np
 
 
@@ -28,6 +29,110 @@ def test_max_drawdown():
     assert np.allclose(test_table.max_drawdown(), 0.443833)
 
 
+def test_indicators():
+    X = generate_brownian_returns(5, 300, vol=1e-2)
+    X.iloc[:3, 1] = np.nan
+    indicators = X.indicators(start="2020-02-01")
+    for name in indicators.index:
+        assert np.allclose(indicators.loc[name], getattr(X, name)(start="2020-02-01"))
+
+    # without start, the leading NaN rows are not a price of 1 in the running max
+    X.iloc[3, 1] = -0.5
+    indicators = X.indicators()
+    for name in indicators.index:
+        assert np.allclose(indicators.loc[name], getattr(X, name)())
+
+    series_indicators = test_table.iloc[:, 0].indicators()
+    assert list(series_indicators.columns) == ["value"]
+    assert np.allclose(series_indicators.loc["sharpe"], test_table.sharpe())
+
+
+def test_rolling_indicators():
+    X = generate_brownian_returns(3, 120, vol=1e-2)
+    X.iloc[:5, 1] = np.nan
+
+    rolling = X.rolling_indicators(30, step=11)
+    expanding = X.expanding_indicators(min_periods=10, step=13)
+    for name in ["sharpe", "sortino", "calmar", "max_drawdown"]:
+        for end in rolling.index:
+            start = end - pd.Timedelta(days=29)
+            assert np.allclose(rolling[name].loc[end], getattr(X, name)(start, end), equal_nan=True)
+        for end in expanding.index:
+            assert np.allclose(expanding[name].loc[end], getattr(X, name)(None, end), equal_nan=True)
+
+    assert isinstance(rolling, Table)
+    assert list(X.iloc[:, 0].rolling_indicators(30).columns) == list(rolling.columns.get_level_values(0).unique())
+
+
+def test_range_indicators():
+    X = generate_brownian_returns(3, 200, vol=1e-2)
+    X.iloc[:5, 1] = np.nan
+    ranges = [(None, None), ("2020-01", "2020-02"), ("2020-03-01", "2020-03-02"), ("2020-05-01", None)]
+
+    range_indicators = X.range_indicators(ranges)
+    for i, (start, end) in enumerate(ranges):
+        for name in ["sharpe", "sortino", "calmar", "max_drawdown"]:
+            assert np.allclose(
+                range_indicators.iloc[i][name], getattr(X, name)(start, end), equal_nan=True
+            )
+
+
+def test_resample_cache():
+    X = generate_brownian_returns(2, 100, vol=1e-2)
+    X.sharpe(), X.sortino(), X.calmar(), X.indicators()
+    info = X.cache_info()
+    assert info["misses"] == 2 and info["hits"] >= 4  # the daily frame and its cumulative series
+
+    X.loc[X.index[:10], "returns_asset_0"] = 0.01
+    assert X.cache_info()["size"] == 0
+    assert np.allclose(X.sharpe(), X.as_df().resample("1D").last().mean() * 252 / (X.std(ddof=0) * np.sqrt(252)))
+
+    X.normalize(inplace=True)
+    assert X.cache_info() == {"hits": 0, "misses": 0, "size": 0}
+
+
+def test_resample_cache_chained_writes():
+    X = generate_brownian_returns(2, 300, vol=1e-2, seed=0)
+    col = X.columns[0]
+    X.iloc[:3, 0] = np.nan
+
+    def fresh():
+        return Table.from_frame(X.copy()).sharpe()
+
+    X.sharpe()
+    X[col].fillna(0.5, inplace=True)
+    assert np.allclose(X.sharpe(), fresh())
+
+    X[col].iloc[:50] = 0.05
+    assert np.allclose(X.sharpe(), fresh())
+
+    # a column of the table sees the writes made on the table
+    serie = X[col]
+    serie.sharpe()
+    X.iloc[0:50, 0] = 0.07
+    assert np.isclose(serie.sharpe(), fresh()[col])
+
+    # a slice sees the writes made on the table, and the table those made on the slice
+    sub = X.iloc[10:]
+    sub.sharpe()
+    X.iloc[20:200, 0] = 0.05
+    assert np.allclose(sub.sharpe(), Table.from_frame(X.iloc[10:].copy()).sharpe())
+    X.sharpe()
+    with pd.option_context("mode.chained_assignment", None):  # the write through a slice is wanted
+        sub.iloc[0:100, 0] = 0.06
+    assert np.allclose(X.sharpe(), fresh())
+
+    # the same for the slices of a series
+    serie = X[col].copy()
+    sub = serie.iloc[10:]
+    sub.sharpe()
+    serie.iloc[20:200] = 0.04
+    assert np.isclose(sub.sharpe(), serie.iloc[10:].copy().sharpe())
+    serie.sharpe()
+    sub.iloc[0:100] = 0.03
+    assert np.isclose(serie.sharpe(), serie.copy().sharpe())
+
+
 def test_as_df():
     assert isinstance(test_table.as_df(), pd.DataFrame)
 
@@ -56,4 +161,136 @@ def test_cumulative():
 
 
 
-    
\ No newline at end of file
+    
+
+def test_chunked_loader(tmp_path):
+    table = Table("tests/data/test_table.csv", header=0)
+    chunked = Table(
+        "tests/data/test_table.csv", header=0, chunksize=100, downcast=True
+    )
+
+    assert chunked.shape == table.shape
+    assert (chunked.dtypes == np.float32).all()
+    assert chunked.index.equals(table.index)
+    assert np.allclose(chunked.values, table.values, atol=1e-7)
+
+    # the same columns and dtypes as the plain loader, with an integer column missing a value
+    mixed = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=250).strftime("%Y-%m-%d"),
+            "x": np.linspace(0, 1, 250),
+            "name": ["a"] * 250,
+            "y": np.arange(250),
+        }
+    )
+    mixed.to_csv(tmp_path / "mixed.csv", index=False)
+    mixed.loc[200, "y"] = None
+    mixed.to_csv(tmp_path / "missing.csv", index=False)
+    for path in (tmp_path / "mixed.csv", tmp_path / "missing.csv"):
+        table = Table(str(path), header=0)
+        chunked = Table(str(path), header=0, chunksize=60)
+        assert list(chunked.columns) == ["x", "name", "y"]
+        assert chunked.equals(table) and (chunked.dtypes == table.dtypes).all()
+
+    # without header, the header row is data and no column is numeric
+    table = Table("tests/data/test_table.csv")
+    chunked = Table("tests/data/test_table.csv", chunksize=100)
+    assert chunked.equals(table) and (chunked.dtypes == table.dtypes).all()
+
+
+def test_save_and_load_npy(tmp_path):
+    table = Table("tests/data/test_table.csv", header=0)
+    table["twice"] = table.iloc[:, 0] * 2
+    path = str(tmp_path / "table.npy")
+    table.save(path)
+
+    assert Table(path).equals(table)
+
+    loaded = Table(path, columns=["twice"], start="2020-02-01", end="2020-03-01")
+    assert loaded.equals(table.loc["2020-02-01":"2020-03-01", ["twice"]])
+
+
+@pytest.mark.parametrize("filetype", ["parquet", "feather"])
+def test_save_and_load_arrow(tmp_path, filetype):
+    pytest.importorskip("pyarrow")
+    table = Table("tests/data/test_table.csv", header=0)
+    table["twice"] = table.iloc[:, 0] * 2
+    path = str(tmp_path / f"table.{filetype}")
+    table.save(path)
+
+    loaded = Table(path)
+    assert loaded.equals(table) and loaded.index.name == "date"
+
+    loaded = Table(path, columns=["twice"], start="2020-02-01", end="2020-03-01")
+    assert loaded.equals(table.loc["2020-02-01":"2020-03-01", ["twice"]])
+
+
+def test_lazy():
+    table = Table(generate_brownian_returns(n_timeseries=5, n_periods=300))
+
+    plan = table.lazy().slice("2020-02-01").stationnarize(order=0.4).normalize()
+    plan = plan.cumulative(end="2020-06-01")
+    expected = Table(table.loc["2020-02-01":].stationnarize(order=0.4)).normalize()
+    expected = Table(expected).cumulative(end="2020-06-01")
+
+    result = plan.collect(block_size=2)
+    assert isinstance(result, Table)
+    assert result.index.equals(expected.index)
+    assert np.allclose(result, expected, equal_nan=True)
+    assert "2020-02-01" in plan.explain()
+
+
+def test_out_of_core(tmp_path):
+    table = Table(generate_brownian_returns(n_timeseries=6, n_periods=300))
+    path = str(tmp_path / "panel.npy")
+    table.save(path)
+
+    # two columns per block
+    expected = Table(table.stationnarize(order=0.4)).normalize()
+    result = (
+        LazyTable(path)
+        .stationnarize(order=0.4)
+        .normalize()
+        .collect(memory_budget=2 * 4 * 8 * 300, sink=str(tmp_path / "out.npy"))
+    )
+    assert np.allclose(result, expected, equal_nan=True)
+
+    # less than a column: blocks of rows overlapping by the window
+    expected = table.stationnarize(order=0.4, method="ffd", threshold=1e-3)
+    result = (
+        LazyTable(path)
+        .stationnarize(order=0.4, method="ffd", threshold=1e-3)
+        .collect(memory_budget=4 * 8 * 6 * 50)
+    )
+    assert np.allclose(result, expected, equal_nan=True)
+
+    indicators = LazyTable(path).indicators(memory_budget=2 * 4 * 8 * 300)
+    assert np.allclose(indicators, table.indicators())
+
+
+def test_fast_construction():
+    frame = pd.DataFrame({"date": ["2020-01-01", "2020-01-02"], "value": [1.0, 2.0]})
+    assert Table(frame).index.name == "date"
+    assert "date" in Table.from_frame(frame).columns  # no sniffing
+
+    table = Table(generate_brownian_returns(n_timeseries=2, n_periods=50))
+    table.stationnarize(order=0.4, inplace=True)
+    assert table.is_stationnary and table.iloc[10:].is_stationnary
+    assert not Table(generate_brownian_returns(n_timeseries=2, n_periods=5)).is_stationnary
+
+
+def test_bootstrap_indicators():
+    table = generate_brownian_returns(n_timeseries=2, n_periods=300, vol=1e-2, seed=0)
+
+    summary, samples = table.bootstrap_indicators(
+        n=50, block_size=10, seed=1, chunk_size=20, return_samples=True
+    )
+    assert samples.shape == (50, 8)
+    assert np.allclose(
+        summary["estimate"].unstack().loc[table.indicators().index], table.indicators()
+    )
+    assert (summary["low"] <= summary["high"]).all()
+    assert summary.equals(table.bootstrap_indicators(n=50, block_size=10, seed=1, chunk_size=20))
+
+    circular = table.iloc[:, 0].bootstrap_indicators(n=20, method="circular", seed=2)
+    assert list(circular.index) == ["sharpe", "sortino", "calmar", "max_drawdown"]